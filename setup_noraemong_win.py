@@ -113,6 +113,7 @@ def install_core_dependencies():
         ("soundfile", None),
         ("faster-whisper", "faster_whisper"),
         ("fuzzywuzzy", None),
+        ("rapidfuzz", None),
         ("python-levenshtein", "Levenshtein"),
         ("demucs", None),
         ("pygame", None),
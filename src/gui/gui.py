@@ -7,9 +7,16 @@ import sys
 import os
 from pathlib import Path
 import threading
+import queue
 import json
+import hashlib
+import shutil
 import subprocess
 import time
+import bisect
+import itertools
+import string
+import webbrowser
 from typing import Optional, Dict, Any
 
 # Try to import tkinter with proper error handling
@@ -28,6 +35,14 @@ except ImportError as e:
     print("\n🌐 Alternative: Use web-only mode")
     TKINTER_AVAILABLE = False
 
+# Numba is optional: without it the Tk player's time lookups run as plain Python
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Add src directories to path for imports
 current_dir = Path(__file__).parent  # This is src/GUI/
 src_dir = current_dir.parent  # This goes to src/
@@ -36,7 +51,11 @@ audio_dir = src_dir / "audio"
 lyrics_dir = src_dir / "lyrics"
 sync_dir = src_dir / "sync"
 
-sys.path.extend([str(src_dir), str(audio_dir), str(lyrics_dir), str(sync_dir)])
+for path in (src_dir, audio_dir, lyrics_dir, sync_dir):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from gui_helpers import open_in_browser, load_sync_data, dumps_compact, link_or_copy
 
 # Import your modules
 try:
@@ -47,6 +66,55 @@ except ImportError as e:
     print(f"⚠️ Import error: {e}")
     print("Make sure all modules are in the correct directories")
 
+def write_html_file(html_file: Path, html_content: str):
+    """Write generated HTML with a single unbuffered write of the encoded bytes"""
+    data = memoryview(html_content.encode('utf-8'))
+    fd = os.open(html_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+    finally:
+        os.close(fd)
+
+def segments_to_js(segments: list) -> bytes:
+    """Serialize only the segment fields the web player reads as compact UTF-8 JSON"""
+    compact = []
+    for segment in segments:
+        entry = {
+            'start_time': segment['start_time'],
+            'end_time': segment['end_time'],
+            'text': segment['text']
+        }
+        if segment.get('word_timings'):
+            entry['word_timings'] = [
+                {'word': w['word'], 'start': w['start'], 'end': w['end']}
+                for w in segment['word_timings']
+            ]
+        compact.append(entry)
+    return dumps_compact(compact)
+
+SEGMENTS_SCRIPT = "segments.js"
+
+# Web karaoke page, read once at import. Rendered with safe_substitute so the
+# JavaScript template literals (${...}) in it pass through untouched.
+KARAOKE_TEMPLATE = string.Template(
+    (Path(__file__).parent / "karaoke_template.html").read_text(encoding='utf-8')
+)
+
+# Page for the CLI launcher, read once at import like KARAOKE_TEMPLATE
+CLI_KARAOKE_TEMPLATE = string.Template(
+    (Path(__file__).parent / "cli_karaoke_template.html").read_text(encoding='utf-8')
+)
+
+def write_segments_script(asset_dir: Path, segments: list):
+    """Write the segments once as a script the player page loads next to it"""
+    # Written in pieces so the payload is never decoded or copied into a larger string
+    with open(asset_dir / SEGMENTS_SCRIPT, 'wb') as f:
+        f.write(b"const segments = ")
+        f.write(segments_to_js(segments))
+        f.write(b";\n")
+
 class KaraokeGUI:
     """Main GUI for the Noraemong Karaoke Machine"""
     
@@ -70,16 +138,18 @@ class KaraokeGUI:
         
         # Data directories
         self.data_dir = root_dir / "data"
-        self.data_dir.mkdir(exist_ok=True)
-        (self.data_dir / "separate").mkdir(exist_ok=True)
-        (self.data_dir / "transcribe_vocal").mkdir(exist_ok=True)
-        (self.data_dir / "sync_output").mkdir(exist_ok=True)
+        for sub in ("separate", "transcribe_vocal", "sync_output"):
+            (self.data_dir / sub).mkdir(parents=True, exist_ok=True)
         
         # Processing results
         self.separated_files = {}
         self.sync_data = {}
         
+        # Result lines queued by update_results, flushed in batches on the Tk thread
+        self.results_queue = queue.Queue()
+        
         self.create_widgets()
+        self.root.after(50, self.flush_results)
         
     def configure_styles(self):
         """Configure custom styles for the GUI"""
@@ -305,6 +375,22 @@ class KaraokeGUI:
         
         if filename:
             self.audio_file.set(filename)
+            # Warm the page cache while the user picks the remaining options
+            threading.Thread(target=self.prewarm_audio_file, args=(filename,), daemon=True).start()
+    
+    def prewarm_audio_file(self, filename: str, chunk_size: int = 1 << 20):
+        """Read the head and tail of the audio file so later decoding hits the page cache"""
+        try:
+            with open(filename, 'rb', buffering=0) as f:
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                size = os.fstat(f.fileno()).st_size
+                f.read(chunk_size)
+                if size > chunk_size:
+                    f.seek(max(chunk_size, size - chunk_size))
+                    f.read(chunk_size)
+        except OSError:
+            pass
     
     def browse_lyrics_file(self):
         """Browse for lyrics file"""
@@ -336,10 +422,23 @@ class KaraokeGUI:
             self.manual_desc.pack(fill=tk.X)
     
     def update_results(self, message: str, color: str = "#ecf0f1"):
-        """Update results text area"""
-        self.results_text.insert(tk.END, message + "\n")
-        self.results_text.see(tk.END)
-        self.root.update()
+        """Queue a line for the results text area (safe from any thread)"""
+        self.results_queue.put(message)
+    
+    def flush_results(self):
+        """Insert queued result lines with a single insert and scroll"""
+        lines = []
+        try:
+            while len(lines) < 64:
+                lines.append(self.results_queue.get_nowait())
+        except queue.Empty:
+            pass
+        
+        if lines:
+            self.results_text.insert(tk.END, "\n".join(lines) + "\n")
+            self.results_text.see(tk.END)
+        
+        self.root.after(50, self.flush_results)
     
     def update_progress(self, value: float, status: str):
         """Update progress bar and status"""
@@ -353,18 +452,31 @@ class KaraokeGUI:
             messagebox.showerror("Error", "Please select an audio file")
             return False
         
-        if not os.path.exists(self.audio_file.get()):
+        # One stat per file: checks existence and rejects empty files
+        try:
+            audio_stat = Path(self.audio_file.get()).stat()
+        except OSError:
             messagebox.showerror("Error", "Audio file does not exist")
             return False
-        
+
+        if audio_stat.st_size == 0:
+            messagebox.showerror("Error", "Audio file is empty")
+            return False
+
         if self.processing_mode.get() == "manual":
             if not self.lyrics_file.get():
                 messagebox.showerror("Error", "Please select a lyrics file for manual mode")
                 return False
-            
-            if not os.path.exists(self.lyrics_file.get()):
+
+            try:
+                lyrics_stat = Path(self.lyrics_file.get()).stat()
+            except OSError:
                 messagebox.showerror("Error", "Lyrics file does not exist")
                 return False
+
+            if lyrics_stat.st_size == 0:
+                messagebox.showerror("Error", "Lyrics file is empty")
+                return False
         
         return True
     
@@ -400,14 +512,21 @@ class KaraokeGUI:
             self.update_progress(10, "Separating vocals and instrumental...")
             self.update_results("\n🔄 Step 1: Separating vocals and instrumental...")
             
-            separator = KaraokeSeparator(
-                output_dir=str(self.data_dir / "separate"),
-                quality=self.quality_var.get(),
-                device=self.device_var.get(),
-                enhance_vocals=True
-            )
+            cache_dir = self.data_dir / "separate" / self.separation_cache_key(audio_path)
+            self.separated_files = self.load_cached_separation(cache_dir)
             
-            self.separated_files = separator.process_song(audio_path, song_name)
+            if self.separated_files:
+                self.update_results("♻️ Reusing cached separation for this audio file")
+            else:
+                separator = KaraokeSeparator(
+                    output_dir=str(cache_dir),
+                    quality=self.quality_var.get(),
+                    device=self.device_var.get(),
+                    enhance_vocals=True
+                )
+                
+                self.separated_files = separator.process_song(audio_path, song_name)
+                self.save_separation_manifest(cache_dir, self.separated_files)
             
             self.update_progress(40, "Audio separation complete")
             self.update_results("✅ Audio separation complete!")
@@ -421,12 +540,12 @@ class KaraokeGUI:
                 
                 # Use transcribe_vocal.py approach
                 transcriber = AudioTranscriber(model_size="large-v3", device=self.device_var.get())
-                segments = transcriber.transcribe_with_timestamps(self.separated_files['vocals'])
                 
-                # Save transcribed lyrics as txt file
+                # Write each transcribed line as soon as the decoder yields it;
+                # only the text is kept, so skip word-level alignment
                 lyrics_file = self.data_dir / "transcribe_vocal" / f"{song_name}_lyrics.txt"
                 with open(lyrics_file, 'w', encoding='utf-8') as f:
-                    for segment in segments:
+                    for segment in transcriber.iter_segments(self.separated_files['vocals'], word_timestamps=False):
                         f.write(segment.text.strip() + "\n")
                 
                 self.update_results(f"📝 Generated lyrics: {lyrics_file}")
@@ -480,6 +599,44 @@ class KaraokeGUI:
             # Re-enable process button
             self.process_btn.config(state='normal')
     
+    def separation_cache_key(self, audio_path: str) -> str:
+        """Hash the audio content together with the separation settings"""
+        digest = hashlib.blake2b(digest_size=8)
+        with open(audio_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        params = (self.quality_var.get(), self.device_var.get(), True)  # enhance_vocals
+        digest.update(repr(params).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def load_cached_separation(self, cache_dir: Path) -> Dict[str, str]:
+        """Return cached separation outputs, or an empty dict on a cache miss"""
+        manifest = cache_dir / "manifest.json"
+        try:
+            with open(manifest, 'r', encoding='utf-8') as f:
+                separated_files = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        if not all(Path(separated_files.get(key, '')).is_file() for key in ('vocals', 'karaoke')):
+            return {}
+        
+        # Mark as recently used for LRU pruning
+        os.utime(cache_dir)
+        return separated_files
+    
+    def save_separation_manifest(self, cache_dir: Path, separated_files: Dict[str, str],
+                                 max_entries: int = 5):
+        """Record separation outputs and prune least recently used cache entries"""
+        with open(cache_dir / "manifest.json", 'w', encoding='utf-8') as f:
+            json.dump(separated_files, f, indent=2, ensure_ascii=False)
+        
+        entries = [d for d in (self.data_dir / "separate").iterdir()
+                   if d != cache_dir and (d / "manifest.json").is_file()]
+        entries.sort(key=lambda d: d.stat().st_mtime, reverse=True)
+        for stale in entries[max_entries - 1:]:
+            shutil.rmtree(stale, ignore_errors=True)
+    
     def test_audio_playback(self):
         """Test audio playback using system player"""
         if not self.sync_data:
@@ -499,13 +656,14 @@ class KaraokeGUI:
                 # Use afplay for testing
                 process = subprocess.Popen(['afplay', instrumental_path])
                 
-                # Let it play for 10 seconds
-                import threading
+                # Let it play for up to 10 seconds; returns early if afplay exits
                 def stop_test():
-                    import time
-                    time.sleep(10)
-                    process.terminate()
-                    self.update_results("⏹️ Audio test completed (10 seconds)")
+                    try:
+                        process.wait(timeout=10)
+                    except subprocess.TimeoutExpired:
+                        process.terminate()
+                        process.wait()
+                    self.update_results("⏹️ Audio test completed")
                 
                 threading.Thread(target=stop_test, daemon=True).start()
                 self.update_results("✅ Audio test started - playing 10 seconds...")
@@ -515,17 +673,19 @@ class KaraokeGUI:
                 # For other systems, try to find a player
                 players = ['ffplay', 'mpv', 'vlc']
                 for player in players:
+                    # Look the player up on PATH rather than spawning it just to probe
+                    player_path = shutil.which(player)
+                    if player_path is None:
+                        continue
                     try:
-                        subprocess.run([player, '--version'], capture_output=True, timeout=2)
-                        process = subprocess.Popen([player, instrumental_path])
+                        process = subprocess.Popen([player_path, instrumental_path])
                         self.update_results(f"✅ Audio test started with {player}")
                         break
-                    except:
+                    except OSError:
                         continue
                 else:
                     # Fallback: just try to open with system default
-                    import webbrowser
-                    webbrowser.open(instrumental_path)
+                    open_in_browser(instrumental_path)
                     self.update_results("🎵 Opened audio file with system default player")
                     
         except Exception as e:
@@ -550,10 +710,6 @@ class KaraokeGUI:
     def launch_web_karaoke_player(self):
         """Launch web-based karaoke player - most reliable approach"""
         try:
-            # Check if we have the web player module
-            import sys
-            sys.path.append(str(src_dir))
-            
             # Import and use the lyrics_video_player
             from lyrics_video_player import create_lyrics_video_player
             
@@ -564,9 +720,10 @@ class KaraokeGUI:
                 audio_path=self.sync_data['instrumental'],
                 sync_json_path=self.sync_data['json_file'],
                 title=f"🎤 {self.sync_data['song_name']} - Noraemong Karaoke",
-                auto_open=True,  # Automatically open in browser
+                auto_open=False,  # Opened below without blocking the GUI
                 server_port=8080
             )
+            open_in_browser(server_url)
             
             self.update_results("✅ Web karaoke player launched successfully!")
             self.update_results(f"🌐 Server running at: {server_url}")
@@ -592,9 +749,6 @@ class KaraokeGUI:
         """Create a simple web karaoke player as fallback"""
         try:
             import tempfile
-            import webbrowser
-            import shutil
-            import json
             
             self.update_results("🔄 Creating simple web karaoke player...")
             
@@ -603,21 +757,20 @@ class KaraokeGUI:
             
             # Copy audio file
             audio_name = Path(self.sync_data['instrumental']).name
-            shutil.copy2(self.sync_data['instrumental'], temp_dir / audio_name)
+            link_or_copy(self.sync_data['instrumental'], temp_dir / audio_name)
             
             # Load and copy sync data
-            with open(self.sync_data['json_file'], 'r', encoding='utf-8') as f:
-                sync_data = json.load(f)
+            sync_data = load_sync_data(self.sync_data['json_file'])
             
             # Create HTML karaoke player
+            write_segments_script(temp_dir, sync_data.get('segments', []))
             html_content = self.generate_web_karaoke_html(audio_name, sync_data)
             
             html_file = temp_dir / "karaoke.html"
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            write_html_file(html_file, html_content)
             
             # Open in browser
-            webbrowser.open(f"file://{html_file}")
+            open_in_browser(f"file://{html_file}")
             
             self.update_results("✅ Simple web karaoke player created!")
             self.update_results(f"📁 Files saved to: {temp_dir}")
@@ -632,517 +785,12 @@ class KaraokeGUI:
         segments = sync_data.get('segments', [])
         song_name = self.sync_data['song_name']
         
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>🎤 {song_name} - Noraemong Karaoke</title>
-    <style>
-        body {{
-            font-family: 'Arial', sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            margin: 0;
-            padding: 20px;
-            color: white;
-            min-height: 100vh;
-        }}
-        
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            text-align: center;
-        }}
-        
-        h1 {{
-            font-size: 3em;
-            margin-bottom: 30px;
-            text-shadow: 3px 3px 6px rgba(0,0,0,0.5);
-            background: linear-gradient(45deg, #ff6b6b, #4ecdc4);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-        }}
-        
-        .audio-player {{
-            background: rgba(255,255,255,0.15);
-            border-radius: 20px;
-            padding: 30px;
-            margin-bottom: 30px;
-            backdrop-filter: blur(10px);
-            box-shadow: 0 8px 32px rgba(0,0,0,0.3);
-        }}
-        
-        audio {{
-            width: 100%;
-            max-width: 800px;
-            height: 60px;
-            border-radius: 30px;
-        }}
-        
-        .controls {{
-            margin: 20px 0;
-            display: flex;
-            justify-content: center;
-            gap: 15px;
-            flex-wrap: wrap;
-        }}
-        
-        .control-btn {{
-            background: rgba(255,255,255,0.2);
-            border: 2px solid rgba(255,255,255,0.3);
-            color: white;
-            padding: 15px 25px;
-            border-radius: 30px;
-            cursor: pointer;
-            font-size: 16px;
-            font-weight: bold;
-            transition: all 0.3s ease;
-        }}
-        
-        .control-btn:hover {{
-            background: rgba(255,255,255,0.3);
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-        }}
-        
-        .lyrics-display {{
-            background: rgba(255,255,255,0.1);
-            border-radius: 20px;
-            padding: 40px;
-            min-height: 500px;
-            max-height: 600px;
-            overflow-y: auto;
-            backdrop-filter: blur(10px);
-            box-shadow: 0 8px 32px rgba(0,0,0,0.3);
-        }}
-        
-        .lyric-line {{
-            margin: 20px 0;
-            padding: 20px;
-            border-radius: 15px;
-            font-size: 28px;
-            line-height: 1.6;
-            transition: all 0.4s ease;
-            cursor: pointer;
-            opacity: 0.7;
-        }}
-        
-        .lyric-line:hover {{
-            background: rgba(255,255,255,0.15);
-            transform: scale(1.02);
-        }}
-        
-        .lyric-line.current {{
-            background: linear-gradient(45deg, rgba(255,107,107,0.3), rgba(78,205,196,0.3));
-            transform: scale(1.05);
-            border-left: 6px solid #4ecdc4;
-            font-weight: bold;
-            opacity: 1;
-            box-shadow: 0 5px 20px rgba(78,205,196,0.3);
-        }}
-        
-        .lyric-line.past {{
-            opacity: 0.5;
-        }}
-        
-        .current-word {{
-            background: linear-gradient(45deg, #ff6b6b, #4ecdc4);
-            color: white;
-            padding: 2px 6px;
-            border-radius: 6px;
-            font-weight: bold;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-            animation: wordPulse 0.3s ease-in-out;
-            box-shadow: 0 2px 10px rgba(255,107,107,0.4);
-        }}
-        
-        .past-word {{
-            color: #bdc3c7;
-            opacity: 0.7;
-        }}
-        
-        .next-word {{
-            background: rgba(255,255,255,0.2);
-            padding: 1px 4px;
-            border-radius: 4px;
-            border: 1px dashed rgba(255,255,255,0.5);
-        }}
-        
-        @keyframes wordPulse {{
-            0% {{ transform: scale(1); }}
-            50% {{ transform: scale(1.1); }}
-            100% {{ transform: scale(1); }}
-        }}
-        
-        .info-bar {{
-            background: rgba(255,255,255,0.1);
-            padding: 15px;
-            border-radius: 10px;
-            margin-top: 20px;
-            display: flex;
-            justify-content: space-between;
-            flex-wrap: wrap;
-        }}
-        
-        .progress-info {{
-            font-size: 18px;
-            font-weight: bold;
-        }}
-        
-        @media (max-width: 768px) {{
-            h1 {{ font-size: 2em; }}
-            .lyric-line {{ font-size: 24px; padding: 15px; }}
-            .controls {{ flex-direction: column; align-items: center; }}
-            .info-bar {{ flex-direction: column; text-align: center; gap: 10px; }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🎤 {song_name}</h1>
-        
-        <div class="audio-player">
-            <audio id="audioPlayer" controls autoplay>
-                <source src="{audio_filename}" type="audio/mpeg">
-                <source src="{audio_filename}" type="audio/wav">
-                Your browser does not support the audio element.
-            </audio>
-        </div>
-        
-        <div class="controls">
-            <button class="control-btn" onclick="toggleAutoScroll()">🔄 Auto-scroll: ON</button>
-            <button class="control-btn" onclick="changeFontSize(-4)">A-</button>
-            <button class="control-btn" onclick="changeFontSize(4)">A+</button>
-            <button class="control-btn" onclick="toggleWordHighlight()">✨ Word Highlight: ON</button>
-            <button class="control-btn" onclick="toggleFullscreen()">⛶ Fullscreen</button>
-            <button class="control-btn" onclick="restartSong()">🔄 Restart</button>
-        </div>
-        
-        <div class="lyrics-display" id="lyricsDisplay">
-            <!-- Lyrics will be populated by JavaScript -->
-        </div>
-        
-        <div class="info-bar">
-            <div class="progress-info" id="progressInfo">Ready to sing! 🎤</div>
-            <div class="progress-info" id="segmentInfo">0 / {len(segments)} lines</div>
-        </div>
-    </div>
-
-    <script>
-        const segments = {json.dumps(segments, indent=2)};
-        const audioPlayer = document.getElementById('audioPlayer');
-        const lyricsDisplay = document.getElementById('lyricsDisplay');
-        const progressInfo = document.getElementById('progressInfo');
-        const segmentInfo = document.getElementById('segmentInfo');
-        
-        let currentSegment = -1;
-        let autoScroll = true;
-        let fontSize = 28;
-        let wordHighlight = true;
-        
-        // Initialize lyrics display
-        function initLyrics() {{
-            lyricsDisplay.innerHTML = '';
-            segments.forEach((segment, index) => {{
-                const lyricDiv = document.createElement('div');
-                lyricDiv.className = 'lyric-line';
-                lyricDiv.id = `line-${{index}}`;
-                lyricDiv.textContent = segment.text;
-                lyricDiv.style.fontSize = fontSize + 'px';
-                
-                // Click to seek
-                lyricDiv.addEventListener('click', () => {{
-                    audioPlayer.currentTime = segment.start_time;
-                }});
-                
-                lyricsDisplay.appendChild(lyricDiv);
-            }});
-        }}
-        
-        // Update lyrics highlighting
-        function updateLyrics() {{
-            const currentTime = audioPlayer.currentTime;
-            const duration = audioPlayer.duration || 1;
-            let newSegment = -1;
-            
-            // Simple sequential search: find the segment that contains current time
-            for (let i = 0; i < segments.length; i++) {{
-                const segment = segments[i];
-                if (currentTime >= segment.start_time && currentTime <= segment.end_time) {{
-                    newSegment = i;
-                    break;
-                }}
-            }}
-            
-            // If no exact match found, find the closest upcoming segment
-            // This handles gaps between segments
-            if (newSegment === -1) {{
-                for (let i = 0; i < segments.length; i++) {{
-                    if (currentTime < segments[i].start_time) {{
-                        // We're before this segment starts
-                        newSegment = Math.max(0, i - 1); // Use previous segment or first segment
-                        break;
-                    }}
-                }}
-                // If we're past all segments, use the last one
-                if (newSegment === -1 && segments.length > 0) {{
-                    newSegment = segments.length - 1;
-                }}
-            }}
-            
-            // Only update if segment actually changed
-            if (newSegment !== currentSegment && newSegment >= 0) {{
-                console.log(`Moving from segment ${{currentSegment}} to ${{newSegment}} at time ${{currentTime.toFixed(2)}}s`);
-                updateSegmentHighlighting(newSegment);
-                currentSegment = newSegment;
-            }}
-            
-            // Update word-level highlighting within current segment
-            if (currentSegment >= 0 && wordHighlight) {{
-                updateWordHighlighting(currentSegment, currentTime);
-            }}
-            
-            // Update progress info
-            const minutes = Math.floor(currentTime / 60);
-            const seconds = Math.floor(currentTime % 60);
-            const totalMinutes = Math.floor(duration / 60);
-            const totalSeconds = Math.floor(duration % 60);
-            
-            progressInfo.textContent = `${{minutes}}:${{seconds.toString().padStart(2, '0')}} / ${{totalMinutes}}:${{totalSeconds.toString().padStart(2, '0')}}`;
-            segmentInfo.textContent = `${{newSegment >= 0 ? newSegment + 1 : 0}} / ${{segments.length}} lines`;
-        }}
-        
-        function updateSegmentHighlighting(newSegment) {{
-            console.log(`Highlighting segment ${{newSegment}}: "${{segments[newSegment]?.text?.substring(0, 30)}}..."`);
-            
-            // Remove ALL highlighting and reset to original text
-            for (let i = 0; i < segments.length; i++) {{
-                const line = document.getElementById(`line-${{i}}`);
-                if (line) {{
-                    line.classList.remove('current', 'past');
-                    line.innerHTML = segments[i].text; // Reset to original text
-                }}
-            }}
-            
-            // Mark all previous segments as past
-            for (let i = 0; i < newSegment; i++) {{
-                const line = document.getElementById(`line-${{i}}`);
-                if (line) {{
-                    line.classList.add('past');
-                }}
-            }}
-            
-            // Highlight current segment
-            if (newSegment >= 0) {{
-                const currentLine = document.getElementById(`line-${{newSegment}}`);
-                if (currentLine) {{
-                    currentLine.classList.add('current');
-                    
-                    // Auto-scroll to current line
-                    if (autoScroll) {{
-                        currentLine.scrollIntoView({{ behavior: 'smooth', block: 'center' }});
-                    }}
-                }}
-            }}
-        }}
-        
-        function updateWordHighlighting(segmentIndex, currentTime) {{
-            const segment = segments[segmentIndex];
-            const line = document.getElementById(`line-${{segmentIndex}}`);
-            
-            if (!segment || !line) return;
-            
-            // Check if this segment has word-level timing data
-            if (!segment.word_timings || segment.word_timings.length === 0) {{
-                // No word timings available, just show the whole line
-                line.innerHTML = segment.text;
-                return;
-            }}
-            
-            // Build highlighted text with word-level timing
-            let highlightedText = segment.text;
-            let activeWordFound = false;
-            
-            // Sort word timings by start time to ensure proper order
-            const sortedWords = [...segment.word_timings].sort((a, b) => a.start - b.start);
-            
-            // Create a mapping of word positions in the text
-            let textPosition = 0;
-            const wordPositions = [];
-            
-            for (const wordTiming of sortedWords) {{
-                const word = wordTiming.word.trim();
-                const wordIndex = segment.text.toLowerCase().indexOf(word.toLowerCase(), textPosition);
-                
-                if (wordIndex >= 0) {{
-                    wordPositions.push({{
-                        timing: wordTiming,
-                        start: wordIndex,
-                        end: wordIndex + word.length,
-                        word: segment.text.substring(wordIndex, wordIndex + word.length)
-                    }});
-                    textPosition = wordIndex + word.length;
-                }}
-            }}
-            
-            // Apply highlighting based on current time
-            if (wordPositions.length > 0) {{
-                let result = '';
-                let lastPos = 0;
-                
-                for (const pos of wordPositions) {{
-                    // Add text before this word
-                    if (pos.start > lastPos) {{
-                        result += segment.text.substring(lastPos, pos.start);
-                    }}
-                    
-                    // Determine word state
-                    const isCurrentWord = currentTime >= pos.timing.start && currentTime <= pos.timing.end;
-                    const isPastWord = currentTime > pos.timing.end;
-                    
-                    if (isCurrentWord) {{
-                        result += `<span class="current-word">${{pos.word}}</span>`;
-                        activeWordFound = true;
-                    }} else if (isPastWord) {{
-                        result += `<span class="past-word">${{pos.word}}</span>`;
-                    }} else {{
-                        // Future word - show with subtle highlight if it's the very next word
-                        const isNextWord = !activeWordFound && pos.timing.start > currentTime && 
-                                         wordPositions.indexOf(pos) === wordPositions.findIndex(w => w.timing.start > currentTime);
-                        if (isNextWord) {{
-                            result += `<span class="next-word">${{pos.word}}</span>`;
-                        }} else {{
-                            result += pos.word;
-                        }}
-                    }}
-                    
-                    lastPos = pos.end;
-                }}
-                
-                // Add any remaining text
-                if (lastPos < segment.text.length) {{
-                    result += segment.text.substring(lastPos);
-                }}
-                
-                line.innerHTML = result;
-            }} else {{
-                // Fallback if word positioning fails
-                line.innerHTML = segment.text;
-            }}
-        }}
-        
-        // Control functions
-        function toggleAutoScroll() {{
-            autoScroll = !autoScroll;
-            event.target.textContent = `🔄 Auto-scroll: ${{autoScroll ? 'ON' : 'OFF'}}`;
-        }}
-        
-        function toggleWordHighlight() {{
-            wordHighlight = !wordHighlight;
-            event.target.textContent = `✨ Word Highlight: ${{wordHighlight ? 'ON' : 'OFF'}}`;
-            
-            // Refresh current segment display
-            if (currentSegment >= 0) {{
-                if (wordHighlight) {{
-                    updateWordHighlighting(currentSegment, audioPlayer.currentTime);
-                }} else {{
-                    // Show plain text
-                    const line = document.getElementById(`line-${{currentSegment}}`);
-                    if (line && segments[currentSegment]) {{
-                        line.innerHTML = segments[currentSegment].text;
-                    }}
-                }}
-            }}
-        }}
-        
-        function changeFontSize(delta) {{
-            fontSize = Math.max(20, Math.min(48, fontSize + delta));
-            const lines = document.querySelectorAll('.lyric-line');
-            lines.forEach(line => {{
-                line.style.fontSize = fontSize + 'px';
-            }});
-        }}
-        
-        function toggleFullscreen() {{
-            if (!document.fullscreenElement) {{
-                document.documentElement.requestFullscreen();
-            }} else {{
-                document.exitFullscreen();
-            }}
-        }}
-        
-        function restartSong() {{
-            audioPlayer.currentTime = 0;
-            audioPlayer.play();
-        }}
-        
-        // Event listeners
-        audioPlayer.addEventListener('timeupdate', updateLyrics);
-        audioPlayer.addEventListener('loadedmetadata', initLyrics);
-        
-        // Keyboard shortcuts
-        document.addEventListener('keydown', (e) => {{
-            switch(e.code) {{
-                case 'Space':
-                    if (e.target.tagName !== 'BUTTON') {{
-                        e.preventDefault();
-                        if (audioPlayer.paused) {{
-                            audioPlayer.play();
-                        }} else {{
-                            audioPlayer.pause();
-                        }}
-                    }}
-                    break;
-                case 'ArrowLeft':
-                    audioPlayer.currentTime = Math.max(0, audioPlayer.currentTime - 10);
-                    break;
-                case 'ArrowRight':
-                    audioPlayer.currentTime = Math.min(audioPlayer.duration, audioPlayer.currentTime + 10);
-                    break;
-                case 'F11':
-                    e.preventDefault();
-                    toggleFullscreen();
-                    break;
-                case 'KeyR':
-                    if (e.ctrlKey || e.metaKey) {{
-                        e.preventDefault();
-                        restartSong();
-                    }}
-                    break;
-            }}
-        }});
-        
-        // Initialize when page loads
-        if (audioPlayer.readyState >= 2) {{
-            initLyrics();
-        }}
-        
-        // Debug: Log segment data on load
-        console.log('Loaded segments:', segments.length);
-        if (segments.length > 0) {{
-            console.log('First segment:', segments[0]);
-            console.log('Last segment:', segments[segments.length - 1]);
-            
-            // Verify segments are sorted by start_time
-            for (let i = 1; i < segments.length; i++) {{
-                if (segments[i].start_time < segments[i-1].start_time) {{
-                    console.warn(`Segments not in order! Segment ${{i}} starts before segment ${{i-1}}`);
-                }}
-            }}
-        }}
-        
-        // Welcome message
-        setTimeout(() => {{
-            if (segments.length > 0) {{
-                progressInfo.textContent = '🎤 Ready to sing! Press space to play/pause';
-                // Start with first segment ready
-                currentSegment = -1; // Will be set properly when audio starts
-            }}
-        }}, 1000);
-    </script>
-</body>
-</html>"""
-        return html
+        return KARAOKE_TEMPLATE.safe_substitute(
+            song_name=song_name,
+            audio_filename=audio_filename,
+            segment_count=len(segments),
+            segments_script=SEGMENTS_SCRIPT
+        )
     
     def show_manual_karaoke_instructions(self):
         """Show manual instructions for karaoke"""
@@ -1179,6 +827,43 @@ class KaraokeGUI:
         """Start the GUI application"""
         self.root.mainloop()
 
+def find_active_index(start_times, end_times, end_max, t):
+    """Index of the latest-started interval containing t, or -1
+    
+    start_times must be sorted; end_max is the running maximum of end_times.
+    """
+    lo, hi = 0, len(start_times)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if start_times[mid] <= t:
+            lo = mid + 1
+        else:
+            hi = mid
+    
+    # Step back over earlier intervals only while one can still contain t
+    i = lo - 1
+    while i >= 0 and end_max[i] >= t:
+        if t <= end_times[i]:
+            return i
+        i -= 1
+    return -1
+
+if NUMBA_AVAILABLE:
+    find_active_index = njit(cache=True)(find_active_index)
+
+def build_time_index(intervals: list, start_key: str, end_key: str):
+    """Sort intervals by start and return (order, start_times, end_times, end_max)"""
+    order = sorted(range(len(intervals)), key=lambda i: intervals[i][start_key])
+    start_times = [intervals[i][start_key] for i in order]
+    end_times = [intervals[i][end_key] for i in order]
+    end_max = list(itertools.accumulate(end_times, max))
+    if NUMBA_AVAILABLE:
+        # Keep float64 so lookups agree exactly with the JSON times
+        start_times, end_times, end_max = (
+            np.array(values, dtype=np.float64) for values in (start_times, end_times, end_max)
+        )
+    return order, start_times, end_times, end_max
+
 class KaraokePlayer:
     """Karaoke player window with synchronized lyrics"""
     
@@ -1188,8 +873,7 @@ class KaraokePlayer:
         self.song_name = song_name
         
         # Load sync data
-        with open(sync_json_path, 'r', encoding='utf-8') as f:
-            self.sync_data = json.load(f)
+        self.sync_data = load_sync_data(sync_json_path)
         
         self.segments = self.sync_data['segments']
         self.current_segment = -1
@@ -1197,6 +881,22 @@ class KaraokePlayer:
         self.is_playing = False
         self.start_time = 0
         self.current_time = 0
+        self.update_job = None
+        
+        # Every time at which the display can change, for scheduling wakeups
+        boundaries = set()
+        for segment in self.segments:
+            boundaries.update((segment['start_time'], segment['end_time']))
+            for word_timing in segment.get('word_timings') or ():
+                boundaries.update((word_timing['start'], word_timing['end']))
+        self.boundaries = sorted(boundaries)
+        
+        # Time-sorted lookup arrays for segments and for each segment's words
+        self.segment_index = build_time_index(self.segments, 'start_time', 'end_time')
+        self.word_indexes = [
+            build_time_index(segment.get('word_timings') or [], 'start', 'end')
+            for segment in self.segments
+        ]
         
         self.setup_player_window()
     
@@ -1268,7 +968,12 @@ class KaraokePlayer:
                                            maximum=100)
         self.progress_bar.pack(fill=tk.X)
         
-        # Click to seek functionality
+        # Click to seek functionality; the bar width is tracked from resize events
+        self.progress_width = 1
+        self.progress_bar.bind(
+            "<Configure>",
+            lambda e: setattr(self, 'progress_width', max(e.width, 1))
+        )
         self.progress_bar.bind("<Button-1>", self.seek_to_position)
     
     def setup_lyrics_display(self, parent):
@@ -1295,6 +1000,13 @@ class KaraokePlayer:
         self.lyrics_canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
+        # Track the visible height from resize events instead of querying it
+        self.canvas_height = 0
+        self.lyrics_canvas.bind(
+            "<Configure>",
+            lambda e: setattr(self, 'canvas_height', e.height)
+        )
+        
         # Create lyrics labels
         self.lyrics_labels = []
         for i, segment in enumerate(self.segments):
@@ -1308,6 +1020,14 @@ class KaraokePlayer:
                            pady=10)
             label.pack(fill=tk.X, padx=20, pady=5)
             self.lyrics_labels.append(label)
+        
+        self.cache_label_positions()
+    
+    def cache_label_positions(self):
+        """Measure label offsets once so scrolling needs no layout queries"""
+        self.scrollable_frame.update_idletasks()
+        self.label_ys = [label.winfo_y() for label in self.lyrics_labels]
+        self.total_height = self.scrollable_frame.winfo_reqheight()
     
     def setup_status(self, parent):
         """Setup status bar"""
@@ -1386,18 +1106,35 @@ class KaraokePlayer:
             # Update lyrics
             self.update_lyrics_display()
             
-            # Schedule next update
-            self.player_window.after(100, self.update_player)
+            # Wake up at the next lyric boundary or clock tick instead of polling
+            next_event = int(self.current_time) + 1
+            i = bisect.bisect_right(self.boundaries, self.current_time)
+            if i < len(self.boundaries):
+                next_event = min(next_event, self.boundaries[i])
+            delay_ms = max(10, int((next_event - self.current_time) * 1000) + 1)
+            
+            if self.update_job is not None:
+                self.player_window.after_cancel(self.update_job)
+            self.update_job = self.player_window.after(delay_ms, self.update_player)
+        else:
+            self.update_job = None
     
     def update_lyrics_display(self):
         """Update lyrics highlighting"""
         new_segment = -1
         
-        # Find current segment
-        for i, segment in enumerate(self.segments):
-            if segment['start_time'] <= self.current_time <= segment['end_time']:
-                new_segment = i
-                break
+        # Playback is mostly monotonic: check the current line and the next one first
+        for i in (self.current_segment, self.current_segment + 1):
+            if 0 <= i < len(self.segments):
+                segment = self.segments[i]
+                if segment['start_time'] <= self.current_time <= segment['end_time']:
+                    new_segment = i
+                    break
+        else:
+            order, start_times, end_times, end_max = self.segment_index
+            rank = find_active_index(start_times, end_times, end_max, self.current_time)
+            if rank >= 0:
+                new_segment = order[rank]
         
         # Update segment highlighting
         if new_segment != self.current_segment:
@@ -1433,11 +1170,9 @@ class KaraokePlayer:
             return
         
         # Find current word
-        current_word = -1
-        for i, word_timing in enumerate(segment['word_timings']):
-            if word_timing['start'] <= self.current_time <= word_timing['end']:
-                current_word = i
-                break
+        order, start_times, end_times, end_max = self.word_indexes[segment_index]
+        rank = find_active_index(start_times, end_times, end_max, self.current_time)
+        current_word = order[rank] if rank >= 0 else -1
         
         if current_word != self.current_word:
             # This is a simplified version - full implementation would need
@@ -1447,30 +1182,29 @@ class KaraokePlayer:
     def scroll_to_segment(self, segment_index):
         """Scroll lyrics to show current segment"""
         if 0 <= segment_index < len(self.lyrics_labels):
-            label = self.lyrics_labels[segment_index]
-            label.update_idletasks()
+            # Labels are laid out lazily if the window was not mapped at setup
+            if self.total_height <= 1:
+                self.cache_label_positions()
             
             # Calculate position to scroll to
-            total_height = self.scrollable_frame.winfo_reqheight()
-            label_y = label.winfo_y()
-            canvas_height = self.lyrics_canvas.winfo_height()
-            
-            if total_height > canvas_height:
-                fraction = label_y / total_height
+            if self.total_height > self.canvas_height:
+                fraction = self.label_ys[segment_index] / self.total_height
                 self.lyrics_canvas.yview_moveto(max(0, fraction - 0.3))
     
     def seek_to_position(self, event):
         """Seek to position based on progress bar click"""
         if self.segments:
             total_duration = self.segments[-1]['end_time']
-            click_position = event.x / self.progress_bar.winfo_width()
+            click_position = event.x / self.progress_width
             new_time = click_position * total_duration
             
             self.current_time = new_time
             if self.is_playing:
                 self.start_time = time.time() - self.current_time
-            
-            self.update_lyrics_display()
+                # Reschedule against the new position
+                self.update_player()
+            else:
+                self.update_lyrics_display()
     
     def show(self):
         """Show the karaoke player window"""
@@ -1542,8 +1276,9 @@ def run_web_only_mode():
         src_dir = current_dir.parent
         root_dir = src_dir.parent
         
-        sys.path.extend([str(src_dir), str(src_dir / "audio"), 
-                        str(src_dir / "lyrics"), str(src_dir / "sync")])
+        for path in (src_dir, src_dir / "audio", src_dir / "lyrics", src_dir / "sync"):
+            if str(path) not in sys.path:
+                sys.path.append(str(path))
         
         from seperate import KaraokeSeparator
         from transcribe_vocal import AudioTranscriber
@@ -1551,10 +1286,8 @@ def run_web_only_mode():
         
         # Create data directories
         data_dir = root_dir / "data"
-        data_dir.mkdir(exist_ok=True)
-        (data_dir / "separate").mkdir(exist_ok=True)
-        (data_dir / "transcribe_vocal").mkdir(exist_ok=True)
-        (data_dir / "sync_output").mkdir(exist_ok=True)
+        for sub in ("separate", "transcribe_vocal", "sync_output"):
+            (data_dir / sub).mkdir(parents=True, exist_ok=True)
         
         song_name = Path(audio_file).stem
         
@@ -1573,11 +1306,10 @@ def run_web_only_mode():
         if mode == "1":
             print("🔄 Auto-generating lyrics...")
             transcriber = AudioTranscriber(model_size="base", device="auto")
-            segments = transcriber.transcribe_with_timestamps(separated_files['vocals'])
             
             lyrics_file = data_dir / "transcribe_vocal" / f"{song_name}_lyrics.txt"
             with open(lyrics_file, 'w', encoding='utf-8') as f:
-                for segment in segments:
+                for segment in transcriber.iter_segments(separated_files['vocals'], word_timestamps=False):
                     f.write(segment.text.strip() + "\n")
             print(f"📝 Generated lyrics: {lyrics_file}")
         
@@ -1612,29 +1344,26 @@ def create_simple_web_karaoke_cli(instrumental_path: str, sync_json_path: str, s
     """Create web karaoke player for CLI mode"""
     try:
         import tempfile
-        import webbrowser
-        import shutil
         
         # Create temporary directory
         temp_dir = Path(tempfile.mkdtemp(prefix="noraemong_cli_"))
         
         # Copy audio file
         audio_name = Path(instrumental_path).name
-        shutil.copy2(instrumental_path, temp_dir / audio_name)
+        link_or_copy(instrumental_path, temp_dir / audio_name)
         
         # Load sync data
-        with open(sync_json_path, 'r', encoding='utf-8') as f:
-            sync_data = json.load(f)
+        sync_data = load_sync_data(sync_json_path)
         
         # Create HTML (reuse the generate_web_karaoke_html function logic)
+        write_segments_script(temp_dir, sync_data.get('segments', []))
         html_content = generate_cli_karaoke_html(audio_name, sync_data, song_name)
         
         html_file = temp_dir / "karaoke.html"
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        write_html_file(html_file, html_content)
         
-        # Open in browser
-        webbrowser.open(f"file://{html_file}")
+        # Open in browser (synchronous: the CLI process exits right after)
+        webbrowser.open(f"file://{html_file}", new=2)
         
         print("✅ Web karaoke player launched!")
         print(f"📁 Files saved to: {temp_dir}")
@@ -1648,162 +1377,11 @@ def create_simple_web_karaoke_cli(instrumental_path: str, sync_json_path: str, s
 
 def generate_cli_karaoke_html(audio_filename: str, sync_data: dict, song_name: str) -> str:
     """Generate HTML for CLI web karaoke player"""
-    segments = sync_data.get('segments', [])
-    
-    return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>🎤 {song_name} - Noraemong Karaoke</title>
-    <style>
-        body {{
-            font-family: 'Arial', sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            margin: 0;
-            padding: 20px;
-            color: white;
-            min-height: 100vh;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            text-align: center;
-        }}
-        h1 {{
-            font-size: 3em;
-            margin-bottom: 30px;
-            text-shadow: 3px 3px 6px rgba(0,0,0,0.5);
-        }}
-        .audio-player {{
-            background: rgba(255,255,255,0.15);
-            border-radius: 20px;
-            padding: 30px;
-            margin-bottom: 30px;
-        }}
-        audio {{
-            width: 100%;
-            max-width: 800px;
-            height: 60px;
-        }}
-        .lyrics-display {{
-            background: rgba(255,255,255,0.1);
-            border-radius: 20px;
-            padding: 40px;
-            min-height: 500px;
-            max-height: 600px;
-            overflow-y: auto;
-        }}
-        .lyric-line {{
-            margin: 20px 0;
-            padding: 20px;
-            border-radius: 15px;
-            font-size: 28px;
-            line-height: 1.6;
-            transition: all 0.4s ease;
-            cursor: pointer;
-            opacity: 0.7;
-        }}
-        .lyric-line.current {{
-            background: linear-gradient(45deg, rgba(255,107,107,0.3), rgba(78,205,196,0.3));
-            transform: scale(1.05);
-            border-left: 6px solid #4ecdc4;
-            font-weight: bold;
-            opacity: 1;
-        }}
-        .lyric-line.past {{
-            opacity: 0.5;
-        }}
-        .current-word {{
-            background: linear-gradient(45deg, #ff6b6b, #4ecdc4);
-            color: white;
-            padding: 2px 6px;
-            border-radius: 6px;
-            font-weight: bold;
-        }}
-        .past-word {{
-            color: #bdc3c7;
-            opacity: 0.7;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🎤 {song_name}</h1>
-        <div class="audio-player">
-            <audio id="audioPlayer" controls autoplay>
-                <source src="{audio_filename}" type="audio/mpeg">
-                <source src="{audio_filename}" type="audio/wav">
-            </audio>
-        </div>
-        <div class="lyrics-display" id="lyricsDisplay"></div>
-    </div>
-
-    <script>
-        const segments = {json.dumps(segments, indent=2)};
-        const audioPlayer = document.getElementById('audioPlayer');
-        const lyricsDisplay = document.getElementById('lyricsDisplay');
-        let currentSegment = -1;
-
-        function initLyrics() {{
-            segments.forEach((segment, index) => {{
-                const lyricDiv = document.createElement('div');
-                lyricDiv.className = 'lyric-line';
-                lyricDiv.id = `line-${{index}}`;
-                lyricDiv.textContent = segment.text;
-                lyricDiv.addEventListener('click', () => {{
-                    audioPlayer.currentTime = segment.start_time;
-                }});
-                lyricsDisplay.appendChild(lyricDiv);
-            }});
-        }}
-
-        function updateLyrics() {{
-            const currentTime = audioPlayer.currentTime;
-            let newSegment = -1;
-            
-            for (let i = 0; i < segments.length; i++) {{
-                if (currentTime >= segments[i].start_time && currentTime <= segments[i].end_time) {{
-                    newSegment = i;
-                    break;
-                }}
-            }}
-            
-            if (newSegment !== currentSegment) {{
-                // Remove all highlighting
-                for (let i = 0; i < segments.length; i++) {{
-                    const line = document.getElementById(`line-${{i}}`);
-                    if (line) {{
-                        line.classList.remove('current', 'past');
-                    }}
-                }}
-                
-                // Add past highlighting
-                for (let i = 0; i < newSegment; i++) {{
-                    const line = document.getElementById(`line-${{i}}`);
-                    if (line) line.classList.add('past');
-                }}
-                
-                // Highlight current
-                if (newSegment >= 0) {{
-                    const currentLine = document.getElementById(`line-${{newSegment}}`);
-                    if (currentLine) {{
-                        currentLine.classList.add('current');
-                        currentLine.scrollIntoView({{ behavior: 'smooth', block: 'center' }});
-                    }}
-                }}
-                
-                currentSegment = newSegment;
-            }}
-        }}
-
-        audioPlayer.addEventListener('timeupdate', updateLyrics);
-        audioPlayer.addEventListener('loadedmetadata', initLyrics);
-        
-        if (audioPlayer.readyState >= 2) initLyrics();
-    </script>
-</body>
-</html>"""
+    return CLI_KARAOKE_TEMPLATE.safe_substitute(
+        song_name=song_name,
+        audio_filename=audio_filename,
+        segments_script=SEGMENTS_SCRIPT
+    )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""
+Shared GUI Helpers
+Small utilities used by both the main GUI and the karaoke player, kept free of
+heavy imports so either module can load them.
+"""
+
+import json
+import os
+import shutil
+import threading
+import webbrowser
+from pathlib import Path
+
+# orjson parses sync files several times faster than the stdlib when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def open_in_browser(url: str):
+    """Open a URL in a new browser tab without blocking the calling thread"""
+    threading.Thread(target=webbrowser.open, args=(url,), kwargs={'new': 2},
+                     daemon=True).start()
+
+def load_sync_data(sync_json_path) -> dict:
+    """Read a sync JSON file, with orjson when it is available"""
+    with open(sync_json_path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+def link_or_copy(src, dst: Path):
+    """Hard-link src to dst, copying only across filesystems or where links fail"""
+    try:
+        # Nothing to do when dst is already this file or an unchanged copy of it
+        src_stat, dst_stat = os.stat(src), os.stat(dst)
+        if (os.path.samestat(src_stat, dst_stat) or
+                (src_stat.st_size == dst_stat.st_size and src_stat.st_mtime == dst_stat.st_mtime)):
+            return
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        # copy2 already uses the platform's in-kernel copy (sendfile/fcopyfile)
+        shutil.copy2(src, dst)
+
+def dumps_compact(value) -> bytes:
+    """Serialize value as compact UTF-8 JSON, with orjson when it is available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
@@ -5,18 +5,79 @@ Integrates lyrics_video_player.py functionality with audio playback
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+import tkinter.font as tkfont
 import json
+import contextlib
+import importlib.util
+import logging
+import html
+import string
+import re
 import time
+import bisect
 import threading
+import concurrent.futures
+import select
+import socket
+import atexit
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-import webbrowser
 import tempfile
 import shutil
 import subprocess
 import sys
+import os
 import platform
 
+logger = logging.getLogger(__name__)
+
+# pygame is only imported where a backend needs it; probe for it once
+PYGAME_AVAILABLE = importlib.util.find_spec('pygame') is not None
+
+# mutagen reads durations from the file header; without it we shell out to afinfo
+try:
+    from mutagen import File as MutagenFile
+    MUTAGEN_AVAILABLE = True
+except ImportError:
+    MUTAGEN_AVAILABLE = False
+
+# Helpers shared with gui.py live next to this file
+if str(Path(__file__).parent) not in sys.path:
+    sys.path.append(str(Path(__file__).parent))
+from gui_helpers import open_in_browser, load_sync_data, dumps_compact, link_or_copy
+
+# PyObjC's AVFoundation gives an in-process player on macOS; without it we
+# fall back to spawning afplay/ffplay
+try:
+    from AVFoundation import AVAudioPlayer
+    from Foundation import NSURL
+    AVFOUNDATION_AVAILABLE = True
+except ImportError:
+    AVFOUNDATION_AVAILABLE = False
+
+# Duration line of afinfo's output, matched on the raw bytes
+AFINFO_DURATION = re.compile(rb'estimated duration:\s*([\d.]+)')
+
+# Audio durations already read, keyed by (path, mtime, size)
+_duration_cache: Dict[tuple, float] = {}
+
+def minify_page(page: str) -> str:
+    """Drop indentation, blank lines and whole-line comments from a page template"""
+    lines = []
+    for line in page.splitlines():
+        line = line.strip()
+        if (not line or line.startswith('//')
+                or (line.startswith('/*') and line.endswith('*/'))
+                or (line.startswith('<!--') and line.endswith('-->'))):
+            continue
+        lines.append(line)
+    return '\n'.join(lines)
+
+# Page written by the simple web player fallback, minified once at import
+SIMPLE_PLAYER_TEMPLATE = string.Template(minify_page(
+    (Path(__file__).parent / "simple_player_template.html").read_text(encoding='utf-8')
+))
+
 class MacOSAudioPlayer:
     """Audio player using macOS system commands - much more reliable than pygame"""
     
@@ -31,41 +92,66 @@ class MacOSAudioPlayer:
         self.audio_file = None
         self.is_initialized = True  # Always true for macOS system player
         
+        # Resolve the player binaries once instead of searching PATH on every play
+        self.afplay_path = shutil.which('afplay') or '/usr/bin/afplay'
+        self.ffplay_path = shutil.which('ffplay')
+        
+        # On macOS one kqueue thread watches every player process for exit
+        self.exit_queue = select.kqueue() if hasattr(select, 'kqueue') else None
+        self.watched = {}
+        self.watcher = None
+        
     def load_audio(self, file_path: str) -> bool:
         """Load audio file"""
         try:
-            if not Path(file_path).exists():
-                print(f"❌ File not found: {file_path}")
+            path = Path(file_path).absolute()
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                logger.error(f"❌ File not found: {file_path}")
                 return False
                 
-            self.audio_file = str(Path(file_path).absolute())
+            self.audio_file = str(path)
             
-            # Get duration using afinfo (macOS built-in)
-            try:
-                result = subprocess.run(['afinfo', self.audio_file], 
-                                     capture_output=True, text=True)
-                for line in result.stdout.split('\n'):
-                    if 'estimated duration' in line:
-                        duration_str = line.split(':')[1].strip().split()[0]
-                        self.total_length = float(duration_str)
-                        break
-                else:
-                    # Fallback: estimate from file size (rough)
-                    file_size = Path(self.audio_file).stat().st_size
-                    # Rough estimate: 44.1kHz * 16bit * 2channels = ~176KB per second
-                    self.total_length = file_size / (44100 * 2 * 2)
-                    
-            except Exception as e:
-                print(f"⚠️ Could not determine duration: {e}")
-                self.total_length = 300  # 5 min default
+            cache_key = (self.audio_file, stat.st_mtime, stat.st_size)
+            if cache_key in _duration_cache:
+                self.total_length = _duration_cache[cache_key]
+            else:
+                self.total_length = self._read_duration(stat.st_size)
+                _duration_cache[cache_key] = self.total_length
                 
-            print(f"🎵 Loaded: {Path(file_path).name} ({self.total_length:.1f}s)")
+            logger.info(f"🎵 Loaded: {path.name} ({self.total_length:.1f}s)")
             return True
             
         except Exception as e:
-            print(f"❌ Failed to load: {e}")
+            logger.error(f"❌ Failed to load: {e}")
             return False
     
+    def _read_duration(self, file_size: int) -> float:
+        """Read the duration from the file header, falling back to afinfo"""
+        if MUTAGEN_AVAILABLE:
+            try:
+                audio = MutagenFile(self.audio_file)
+                if audio is not None and audio.info.length > 0:
+                    return audio.info.length
+            except Exception as e:
+                logger.warning(f"⚠️ mutagen could not read duration: {e}")
+        
+        # Get duration using afinfo (macOS built-in)
+        try:
+            result = subprocess.run(['afinfo', self.audio_file], capture_output=True)
+            match = AFINFO_DURATION.search(result.stdout)
+            if match:
+                return float(match.group(1))
+            
+            # Fallback: estimate from file size (rough)
+            # Rough estimate: 44.1kHz * 16bit * 2channels = ~176KB per second
+            return file_size / (44100 * 2 * 2)
+                
+        except Exception as e:
+            logger.warning(f"⚠️ Could not determine duration: {e}")
+            return 300  # 5 min default
+    
     def play(self) -> bool:
         """Start playback using afplay (macOS built-in)"""
         try:
@@ -74,49 +160,84 @@ class MacOSAudioPlayer:
                 self.process.terminate()
                 self.process = None
             
-            print(f"▶️ Starting playback: {Path(self.audio_file).name}")
+            logger.info(f"▶️ Starting playback: {Path(self.audio_file).name}")
             
             # Use afplay for reliable macOS audio playback
-            if self.current_position > 0:
-                # For seeking, we need to use a different approach
-                # afplay doesn't support seeking, so we'll use ffplay if available
-                try:
-                    self.process = subprocess.Popen([
-                        'ffplay', '-ss', str(self.current_position), 
-                        '-nodisp', '-autoexit', '-loglevel', 'quiet',
-                        self.audio_file
-                    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                    print(f"🎵 Using ffplay with seek to {self.current_position:.1f}s")
-                except FileNotFoundError:
+            # close_fds=False skips closing every inherited descriptor in the child
+            if self.current_position > 0 and self.ffplay_path:
+                # afplay doesn't support seeking, so seek with ffplay instead.
+                # Low-delay flags skip ffplay's stream probing and pre-buffering,
+                # and -ss before the input seeks in the demuxer
+                self.process = subprocess.Popen([
+                    self.ffplay_path, '-fflags', 'nobuffer', '-flags', 'low_delay',
+                    '-probesize', '32', '-analyzeduration', '0',
+                    '-ss', str(self.current_position),
+                    '-nodisp', '-autoexit', '-loglevel', 'quiet',
+                    self.audio_file
+                ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, close_fds=False)
+                logger.info(f"🎵 Using ffplay with seek to {self.current_position:.1f}s")
+            else:
+                if self.current_position > 0:
                     # Fallback: use afplay from beginning
-                    print("⚠️ ffplay not found, playing from beginning")
+                    logger.warning("⚠️ ffplay not found, playing from beginning")
                     self.current_position = 0
-                    self.process = subprocess.Popen(['afplay', self.audio_file])
-            else:
-                # Play from beginning with afplay
-                self.process = subprocess.Popen(['afplay', self.audio_file])
-                print("🎵 Using afplay from beginning")
+                else:
+                    logger.info("🎵 Using afplay from beginning")
+                self.process = subprocess.Popen([self.afplay_path, self.audio_file],
+                                                close_fds=False)
                 
             self.is_playing = True
             self.is_paused = False
-            self.start_time = time.time() - self.current_position
+            self.start_time = time.monotonic() - self.current_position
             
-            # Start a thread to monitor when playback ends
-            threading.Thread(target=self._monitor_playback, daemon=True).start()
+            # Get notified when playback ends
+            self._watch_process(self.process)
             
             return True
             
         except Exception as e:
-            print(f"❌ Playback failed: {e}")
+            logger.error(f"❌ Playback failed: {e}")
             return False
     
-    def _monitor_playback(self):
+    def _watch_process(self, process):
+        """Call _on_process_exit once the player process exits"""
+        if self.exit_queue is None:
+            threading.Thread(target=lambda: (process.wait(), self._on_process_exit(process)),
+                             daemon=True).start()
+            return
+        
+        self.watched[process.pid] = process
+        event = select.kevent(process.pid, filter=select.KQ_FILTER_PROC,
+                              flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                              fflags=select.KQ_NOTE_EXIT)
+        try:
+            self.exit_queue.control([event], 0)
+        except ProcessLookupError:
+            # Already gone before we could register it
+            self.watched.pop(process.pid, None)
+            process.wait()
+            self._on_process_exit(process)
+            return
+        
+        if self.watcher is None:
+            self.watcher = threading.Thread(target=self._watch_exits, daemon=True)
+            self.watcher.start()
+    
+    def _watch_exits(self):
+        """Dispatch exit events for all watched player processes"""
+        while True:
+            for event in self.exit_queue.control(None, 8):
+                process = self.watched.pop(event.ident, None)
+                if process:
+                    process.wait()  # Reap the exited child
+                    self._on_process_exit(process)
+    
+    def _on_process_exit(self, process):
         """Monitor when playback ends"""
-        if self.process:
-            self.process.wait()  # Wait for process to end
-            if self.is_playing:  # If we were supposed to be playing
-                self.is_playing = False
-                print("⏹️ Playback ended")
+        # Ignore processes we replaced or terminated ourselves
+        if process is self.process and self.is_playing:
+            self.is_playing = False
+            logger.info("⏹️ Playback ended")
     
     def pause(self):
         """Pause playback"""
@@ -126,7 +247,7 @@ class MacOSAudioPlayer:
             self.process = None
             self.is_playing = False
             self.is_paused = True
-            print(f"⏸️ Paused at {self.pause_position:.1f}s")
+            logger.info(f"⏸️ Paused at {self.pause_position:.1f}s")
     
     def stop(self):
         """Stop playback"""
@@ -137,7 +258,7 @@ class MacOSAudioPlayer:
         self.is_paused = False
         self.current_position = 0
         self.pause_position = 0
-        print("⏹️ Stopped")
+        logger.info("⏹️ Stopped")
     
     def get_position(self) -> float:
         """Get current playback position"""
@@ -148,7 +269,7 @@ class MacOSAudioPlayer:
             return self.pause_position
         
         if self.is_playing:
-            elapsed = time.time() - self.start_time
+            elapsed = time.monotonic() - self.start_time
             return min(elapsed, self.total_length)
         
         return self.current_position
@@ -162,7 +283,7 @@ class MacOSAudioPlayer:
             self.stop()
             self.play()
         
-        print(f"⏭️ Seeked to {self.current_position:.1f}s")
+        logger.info(f"⏭️ Seeked to {self.current_position:.1f}s")
     
     def set_volume(self, volume: float):
         """Set system volume (macOS)"""
@@ -171,7 +292,237 @@ class MacOSAudioPlayer:
             subprocess.run(['osascript', '-e', f'set volume output volume {vol_level}'], 
                          capture_output=True)
         except Exception as e:
-            print(f"⚠️ Volume control failed: {e}")
+            logger.warning(f"⚠️ Volume control failed: {e}")
+    
+    def close(self):
+        """Stop the player process, if one is running"""
+        if self.process:
+            self.process.terminate()
+            self.process = None
+        self.is_playing = False
+        self.is_paused = False
+
+class AVFoundationAudioPlayer:
+    """Audio player using AVAudioPlayer in-process - seeks without restarting playback"""
+    
+    def __init__(self):
+        self.player = None
+        self.total_length = 0
+        self.is_paused = False
+        self.is_initialized = True
+    
+    @property
+    def is_playing(self) -> bool:
+        return self.player is not None and bool(self.player.isPlaying())
+    
+    def load_audio(self, file_path: str) -> bool:
+        """Load audio file"""
+        try:
+            path = Path(file_path).absolute()
+            if not path.exists():
+                logger.error(f"❌ File not found: {file_path}")
+                return False
+            
+            url = NSURL.fileURLWithPath_(str(path))
+            player, error = AVAudioPlayer.alloc().initWithContentsOfURL_error_(url, None)
+            if player is None:
+                logger.error(f"❌ Failed to load: {error}")
+                return False
+            
+            player.prepareToPlay()
+            self.player = player
+            self.total_length = player.duration()
+            self.is_paused = False
+            logger.info(f"🎵 Loaded: {path.name} ({self.total_length:.1f}s)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to load: {e}")
+            return False
+    
+    def play(self) -> bool:
+        """Start or resume playback"""
+        if self.player is None or not self.player.play():
+            logger.error("❌ Playback failed")
+            return False
+        self.is_paused = False
+        return True
+    
+    def pause(self):
+        """Pause playback"""
+        if self.is_playing:
+            self.player.pause()
+            self.is_paused = True
+            logger.info(f"⏸️ Paused at {self.get_position():.1f}s")
+    
+    def stop(self):
+        """Stop playback"""
+        if self.player is not None:
+            self.player.stop()
+            self.player.setCurrentTime_(0)
+        self.is_paused = False
+        logger.info("⏹️ Stopped")
+    
+    def get_position(self) -> float:
+        """Get current playback position"""
+        return self.player.currentTime() if self.player is not None else 0.0
+    
+    def seek(self, position: float):
+        """Seek to position"""
+        if self.player is not None:
+            self.player.setCurrentTime_(max(0, min(position, self.total_length)))
+            logger.info(f"⏭️ Seeked to {self.get_position():.1f}s")
+    
+    def set_volume(self, volume: float):
+        """Set player volume"""
+        if self.player is not None:
+            self.player.setVolume_(max(0.0, min(1.0, volume)))
+    
+    def close(self):
+        """Release the in-process player"""
+        if self.player is not None:
+            self.player.stop()
+            self.player = None
+        self.is_paused = False
+
+class MpvAudioPlayer(MacOSAudioPlayer):
+    """Audio player driving one long-lived mpv over its JSON IPC socket - no process per seek"""
+    
+    def __init__(self, mpv_path: str):
+        super().__init__()
+        self.mpv_path = mpv_path
+        self.socket_dir = tempfile.mkdtemp(prefix='noraemong_')
+        self.socket_path = str(Path(self.socket_dir) / 'mpv.sock')
+        self.ipc = None
+        atexit.register(self.close)
+    
+    def load_audio(self, file_path: str) -> bool:
+        """Load audio file into a paused mpv"""
+        if not super().load_audio(file_path):
+            return False
+        
+        try:
+            self._close()
+            self.process = subprocess.Popen([
+                self.mpv_path, '--idle=yes', '--keep-open=yes', '--pause',
+                '--no-video', '--really-quiet',
+                f'--input-ipc-server={self.socket_path}', self.audio_file
+            ], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+               stderr=subprocess.DEVNULL, close_fds=False)
+            self.ipc = self._connect()
+            threading.Thread(target=self._read_events, args=(self.ipc,), daemon=True).start()
+            self._command('observe_property', 1, 'eof-reached')
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to start mpv: {e}")
+            self._close()
+            return False
+    
+    def _connect(self) -> socket.socket:
+        """Connect to mpv's IPC socket once it is listening"""
+        deadline = time.monotonic() + 5
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.socket_path)
+                return sock
+            except OSError:
+                sock.close()
+                if time.monotonic() > deadline or self.process.poll() is not None:
+                    raise
+                time.sleep(0.02)
+    
+    def _command(self, *args):
+        """Send one IPC command; replies are drained by _read_events"""
+        if self.ipc:
+            try:
+                self.ipc.sendall(json.dumps({'command': list(args)}).encode() + b'\n')
+            except OSError as e:
+                logger.warning(f"⚠️ mpv command failed: {e}")
+    
+    def _read_events(self, sock: socket.socket):
+        """Watch mpv's event stream for the end of the track"""
+        try:
+            for line in sock.makefile('rb'):
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if (message.get('event') == 'property-change'
+                        and message.get('name') == 'eof-reached'
+                        and message.get('data') and self.is_playing):
+                    self.is_playing = False
+                    logger.info("⏹️ Playback ended")
+        except OSError:
+            pass  # Socket closed
+    
+    def _close(self):
+        """Shut down the mpv process"""
+        if self.ipc:
+            self.ipc.close()
+            self.ipc = None
+        if self.process:
+            self.process.terminate()
+            self.process = None
+    
+    def close(self):
+        """Shut down mpv for good when the player window closes"""
+        self._close()
+        shutil.rmtree(self.socket_dir, ignore_errors=True)
+        self.is_playing = False
+        self.is_paused = False
+    
+    def play(self) -> bool:
+        """Start or resume playback"""
+        if not self.ipc:
+            logger.error("❌ Playback failed: mpv is not running")
+            return False
+        
+        if self.is_paused:
+            position = self.pause_position
+        else:
+            position = self.current_position
+            self._command('seek', position, 'absolute')
+        self._command('set_property', 'pause', False)
+        
+        self.is_playing = True
+        self.is_paused = False
+        self.start_time = time.monotonic() - position
+        logger.info(f"▶️ Playing from {position:.1f}s")
+        return True
+    
+    def pause(self):
+        """Pause playback"""
+        if self.is_playing:
+            self._command('set_property', 'pause', True)
+            self.pause_position = self.get_position()
+            self.is_playing = False
+            self.is_paused = True
+            logger.info(f"⏸️ Paused at {self.pause_position:.1f}s")
+    
+    def stop(self):
+        """Stop playback"""
+        self._command('set_property', 'pause', True)
+        self.is_playing = False
+        self.is_paused = False
+        self.current_position = 0
+        self.pause_position = 0
+        logger.info("⏹️ Stopped")
+    
+    def seek(self, position: float):
+        """Seek to position"""
+        self.current_position = max(0, min(position, self.total_length))
+        self._command('seek', self.current_position, 'absolute')
+        if self.is_playing:
+            self.start_time = time.monotonic() - self.current_position
+        elif self.is_paused:
+            self.pause_position = self.current_position
+        logger.info(f"⏭️ Seeked to {self.current_position:.1f}s")
+    
+    def set_volume(self, volume: float):
+        """Set player volume"""
+        self._command('set_property', 'volume', max(0, min(100, volume * 100)))
 
 class AudioPlayer:
     """Smart audio player that chooses the best backend for the platform"""
@@ -186,18 +537,24 @@ class AudioPlayer:
         system = platform.system().lower()
         
         if system == "darwin":  # macOS
-            print("🍎 Using macOS system audio player (afplay)")
-            self.backend = MacOSAudioPlayer()
+            if AVFOUNDATION_AVAILABLE:
+                logger.info("🍎 Using macOS AVAudioPlayer")
+                self.backend = AVFoundationAudioPlayer()
+            elif shutil.which('mpv'):
+                logger.info("🍎 Using mpv audio player")
+                self.backend = MpvAudioPlayer(shutil.which('mpv'))
+            else:
+                logger.info("🍎 Using macOS system audio player (afplay)")
+                self.backend = MacOSAudioPlayer()
             self.is_initialized = True
         else:
             # Try pygame for other systems
-            try:
-                import pygame
+            if PYGAME_AVAILABLE:
                 self.backend = self._create_pygame_player()
                 self.is_initialized = True
-                print("🎮 Using pygame audio player")
-            except ImportError:
-                print("❌ No suitable audio backend found")
+                logger.info("🎮 Using pygame audio player")
+            else:
+                logger.error("❌ No suitable audio backend found")
                 self.is_initialized = False
     
     def _create_pygame_player(self):
@@ -223,22 +580,22 @@ class AudioPlayer:
                     self.total_length = librosa.get_duration(filename=file_path)
                     return True
                 except Exception as e:
-                    print(f"❌ Failed to load: {e}")
+                    logger.error(f"❌ Failed to load: {e}")
                     return False
             
             def play(self):
                 try:
                     if self.is_paused:
                         pygame.mixer.music.unpause()
-                        self.start_time = time.time() - self.pause_position
+                        self.start_time = time.monotonic() - self.pause_position
                         self.is_paused = False
                     else:
                         pygame.mixer.music.play(start=self.current_position)
-                        self.start_time = time.time() - self.current_position
+                        self.start_time = time.monotonic() - self.current_position
                     self.is_playing = True
                     return True
                 except Exception as e:
-                    print(f"❌ Play failed: {e}")
+                    logger.error(f"❌ Play failed: {e}")
                     return False
             
             def pause(self):
@@ -260,7 +617,7 @@ class AudioPlayer:
                     return self.current_position
                 if self.is_paused:
                     return self.pause_position
-                return time.time() - self.start_time
+                return time.monotonic() - self.start_time
             
             def seek(self, position):
                 self.current_position = max(0, min(position, self.total_length))
@@ -270,6 +627,9 @@ class AudioPlayer:
             
             def set_volume(self, volume):
                 pygame.mixer.music.set_volume(max(0.0, min(1.0, volume)))
+            
+            def close(self):
+                pygame.mixer.quit()
         
         return PygamePlayer()
     
@@ -299,6 +659,11 @@ class AudioPlayer:
         if self.backend:
             self.backend.set_volume(volume)
     
+    def close(self):
+        """Stop the backend's player process or release its audio device"""
+        if self.backend:
+            self.backend.close()
+    
     @property
     def total_length(self) -> float:
         return self.backend.total_length if self.backend else 0.0
@@ -314,6 +679,10 @@ class AudioPlayer:
 class EnhancedKaraokePlayer:
     """Enhanced karaoke player with professional features"""
     
+    LYRICS_PADX = 20  # Canvas margin on each side of a lyrics row
+    LYRICS_TEXT_PADX = 10  # Label padding around the wrapped text
+    LYRICS_ROW_SPACING = 5  # Gap above and below each lyrics row
+    
     def __init__(self, instrumental_path: str, sync_json_path: str, song_name: str, 
                  launch_web_player: bool = True):
         self.instrumental_path = instrumental_path
@@ -322,13 +691,26 @@ class EnhancedKaraokePlayer:
         self.launch_web_player = launch_web_player
         
         # Load sync data
-        with open(sync_json_path, 'r', encoding='utf-8') as f:
-            self.sync_data = json.load(f)
+        self.sync_data = load_sync_data(sync_json_path)
         
         self.segments = self.sync_data['segments']
         self.current_segment = -1
         self.current_word = -1
         
+        # Sorted lyric boundaries, to poll faster only when one is close
+        self.boundaries = sorted({t for segment in self.segments
+                                  for t in (segment['start_time'], segment['end_time'])})
+        self.last_second = None
+        self.last_progress = None
+        self.update_job = None
+        self.volume_job = None
+        
+        # Segment indices sorted by start time, for bisecting the current line
+        self.time_order = sorted(range(len(self.segments)),
+                                 key=lambda i: self.segments[i]['start_time'])
+        self.start_times = [self.segments[i]['start_time'] for i in self.time_order]
+        self.end_times = [self.segments[i]['end_time'] for i in self.time_order]
+        
         # Audio player
         self.audio_player = AudioPlayer()
         
@@ -337,8 +719,10 @@ class EnhancedKaraokePlayer:
         self.font_size = 24
         self.auto_scroll = True
         
-        # Web player
-        self.web_player_url = None
+        # Web player, built in the background; resolves to its URL or None
+        self.web_player_future = None
+        self.simple_player_file = None  # Written on first open, then reused
+        self.temp_dir: Optional[Path] = None  # Shared by both web players
         
         self.setup_player_window()
         self.load_audio()
@@ -420,8 +804,12 @@ class EnhancedKaraokePlayer:
         
         # Song info
         info_text = f"🎵 {len(self.segments)} lyrics segments"
-        if self.sync_data.get('metadata'):
-            avg_conf = sum(s.get('confidence', 0) for s in self.segments) / len(self.segments)
+        metadata = self.sync_data.get('metadata')
+        if metadata:
+            # Newer sync files carry the average; older ones need a pass
+            avg_conf = metadata.get('average_confidence')
+            if avg_conf is None:
+                avg_conf = sum(s.get('confidence', 0) for s in self.segments) / len(self.segments)
             info_text += f" • Quality: {avg_conf:.1%}"
         
         info_label = ttk.Label(title_frame, text=info_text, style='Dark.TLabel')
@@ -538,41 +926,177 @@ class EnhancedKaraokePlayer:
         canvas_frame.pack(fill=tk.BOTH, expand=True)
         
         self.lyrics_canvas = tk.Canvas(canvas_frame, bg='#2c3e50', highlightthickness=0)
-        scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=self.lyrics_canvas.yview)
-        
-        self.scrollable_frame = tk.Frame(self.lyrics_canvas, bg='#2c3e50')
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.lyrics_canvas.configure(scrollregion=self.lyrics_canvas.bbox("all"))
-        )
-        
-        self.lyrics_canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=self.on_lyrics_scroll)
         self.lyrics_canvas.configure(yscrollcommand=scrollbar.set)
         
         self.lyrics_canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # Create lyrics labels
+        # Lyrics are laid out as rows measured for their wrapped text; only a
+        # pool of labels exists and each label is recycled for whichever row it is over
+        self.segment_texts = [segment['text'] for segment in self.segments]
+        
+        # Shared fonts: resizing them re-renders every label that uses them
+        self.normal_font = tkfont.Font(family='Arial', size=self.font_size)
+        self.bold_font = tkfont.Font(family='Arial', size=self.font_size, weight='bold')
+        
         self.lyrics_labels = []
-        for i, segment in enumerate(self.segments):
-            label = tk.Label(self.scrollable_frame, 
-                           text=segment['text'],
-                           font=('Arial', self.font_size),
-                           bg='#2c3e50',
-                           fg='#bdc3c7',
-                           wraplength=800,
-                           justify=tk.LEFT,
-                           pady=15,
-                           cursor='hand2')
+        self.label_windows = []
+        self.label_rows = []
+        self.window.bind_class('LyricRow', '<Button-1>', self.on_lyrics_click)
+        
+        # Until the first <Configure> reports the real size
+        self.canvas_width = 800 + 2 * self.LYRICS_PADX
+        self.canvas_height = 1
+        
+        # Never shown: sizes each row as its label would lay it out highlighted
+        self.measure_label = self.create_lyric_label(font=self.bold_font)
+        self.update_row_heights()
+        self.lyrics_canvas.bind("<Configure>", self.on_lyrics_configure)
+        
+        # Mouse wheel scrolling
+        self.lyrics_canvas.bind("<MouseWheel>", self.on_mousewheel)
+    
+    def create_lyric_label(self, **options) -> tk.Label:
+        """Label configured like every lyrics row"""
+        return tk.Label(self.lyrics_canvas,
+                        bg='#2c3e50',
+                        fg='#bdc3c7',
+                        wraplength=self.wrap_length(),
+                        justify=tk.LEFT,
+                        anchor='w',
+                        bd=0,
+                        padx=self.LYRICS_TEXT_PADX,
+                        pady=15,
+                        cursor='hand2',
+                        **options)
+    
+    def label_width(self) -> int:
+        """Width of a row's label: the canvas minus the side padding"""
+        return max(1, self.canvas_width - 2 * self.LYRICS_PADX)
+    
+    def wrap_length(self) -> int:
+        """Wrap lyrics at 800px, or sooner when the label is narrower"""
+        return max(1, min(800, self.label_width() - 2 * self.LYRICS_TEXT_PADX))
+    
+    def update_row_heights(self):
+        """Measure every row for the current font and width and reset the scroll region"""
+        wrap_length = self.wrap_length()
+        self.measure_label.config(wraplength=wrap_length)
+        
+        # row_tops[i] is the top of row i; row_tops[-1] is the total height
+        self.row_tops = [0]
+        for text in self.segment_texts:
+            self.measure_label.config(text=text)
+            self.row_tops.append(self.row_tops[-1] + self.measure_label.winfo_reqheight()
+                                 + 2 * self.LYRICS_ROW_SPACING)
+        self.measured_wrap_length = wrap_length
+        
+        # Shortest possible row: one line of text
+        self.row_height = (self.bold_font.metrics('linespace') + 2 * 15
+                           + 2 * self.LYRICS_ROW_SPACING)
+        self.lyrics_canvas.configure(
+            scrollregion=(0, 0, self.canvas_width, self.row_tops[-1])
+        )
+        self.reset_label_pool()
+    
+    def reset_label_pool(self):
+        """Size the pool to cover a screenful of the shortest rows and rebind every label"""
+        pool_size = self.canvas_height // self.row_height + 2
+        while len(self.lyrics_labels) < pool_size:
+            label = self.create_lyric_label(font=self.normal_font)
             
-            # Click to seek functionality
-            label.bind("<Button-1>", lambda e, idx=i: self.seek_to_segment(idx))
+            # Click to seek: all labels share one class binding
+            label.bindtags(('LyricRow',) + label.bindtags())
             
-            label.pack(fill=tk.X, padx=20, pady=5)
+            window = self.lyrics_canvas.create_window(self.LYRICS_PADX, 0, window=label,
+                                                      anchor="nw", state='hidden')
             self.lyrics_labels.append(label)
+            self.label_windows.append(window)
+        
+        # Every pooled label has to be repositioned
+        wrap_length = self.wrap_length()
+        for label, window in zip(self.lyrics_labels, self.label_windows):
+            label.config(wraplength=wrap_length)
+            self.lyrics_canvas.itemconfigure(window, width=self.label_width(), state='hidden')
+        self.label_rows = [-1] * len(self.lyrics_labels)
+        self.layout_visible_rows()
+    
+    def on_lyrics_configure(self, event):
+        """Track the canvas size, re-measure rows if the wrap width changed, fill new rows"""
+        self.canvas_width = event.width
+        self.canvas_height = event.height
+        if self.wrap_length() != self.measured_wrap_length:
+            self.update_row_heights()
+        else:
+            self.lyrics_canvas.configure(
+                scrollregion=(0, 0, self.canvas_width, self.row_tops[-1])
+            )
+            self.reset_label_pool()
+    
+    def row_at(self, y: float) -> int:
+        """Lyrics row at canvas y coordinate, or -1 past either end"""
+        row = bisect.bisect_right(self.row_tops, y) - 1
+        return row if 0 <= row < len(self.segments) else -1
+    
+    def on_lyrics_click(self, event):
+        """Seek to the lyrics row under the click"""
+        y = self.lyrics_canvas.canvasy(event.y_root - self.lyrics_canvas.winfo_rooty())
+        row = self.row_at(y)
+        if row >= 0:
+            self.seek_to_segment(row)
+    
+    def on_lyrics_scroll(self, *args):
+        """Scrollbar command: scroll, then recycle labels onto the visible rows"""
+        self.lyrics_canvas.yview(*args)
+        self.layout_visible_rows()
+    
+    def row_style(self, row: int) -> Dict[str, Any]:
+        """Label options for a lyrics row"""
+        if row == self.current_segment:
+            return {'fg': '#ffffff', 'bg': '#3498db', 'font': self.bold_font}
+        return {'fg': '#bdc3c7', 'bg': '#2c3e50', 'font': self.normal_font}
+    
+    def layout_visible_rows(self):
+        """Bind the label pool to the rows in view; rows keep their slot while visible"""
+        pool_size = len(self.lyrics_labels)
+        top = self.lyrics_canvas.canvasy(0)
+        first = max(0, bisect.bisect_right(self.row_tops, top) - 1)
+        last = min(len(self.segments), first + pool_size,
+                   bisect.bisect_left(self.row_tops, top + self.canvas_height))
+        visible = set()
+        for row in range(first, last):
+            slot = row % pool_size
+            visible.add(slot)
+            if self.label_rows[slot] != row:
+                self.label_rows[slot] = row
+                self.lyrics_labels[slot].config(text=self.segment_texts[row], **self.row_style(row))
+                # The label fills its measured row, so the highlight band covers it
+                self.lyrics_canvas.coords(self.label_windows[slot], self.LYRICS_PADX,
+                                          self.row_tops[row] + self.LYRICS_ROW_SPACING)
+                self.lyrics_canvas.itemconfigure(
+                    self.label_windows[slot], state='normal',
+                    height=self.row_tops[row + 1] - self.row_tops[row] - 2 * self.LYRICS_ROW_SPACING
+                )
         
-        # Mouse wheel scrolling
-        self.lyrics_canvas.bind("<MouseWheel>", self.on_mousewheel)
+        # Hide labels whose row scrolled away without being reused
+        for slot in range(pool_size):
+            if slot not in visible and self.label_rows[slot] != -1:
+                self.label_rows[slot] = -1
+                self.lyrics_canvas.itemconfigure(self.label_windows[slot], state='hidden')
+    
+    def restyle_rows(self, *rows: int):
+        """Restyle the rows' labels, for those bound to one, in a single Tcl call"""
+        commands = []
+        for row in rows:
+            if row >= 0:
+                slot = row % len(self.lyrics_labels)
+                if self.label_rows[slot] == row:
+                    style = self.row_style(row)
+                    commands.append(f"{self.lyrics_labels[slot]} configure "
+                                    f"-fg {style['fg']} -bg {style['bg']} -font {style['font']}")
+        if commands:
+            self.window.tk.eval('\n'.join(commands))
     
     def create_status_section(self):
         """Create status bar"""
@@ -617,6 +1141,7 @@ class EnhancedKaraokePlayer:
             if self.audio_player.play():
                 self.play_btn.config(text="⏸️ Pause")
                 self.status_var.set("Playing")
+                self.refresh_display()
             else:
                 messagebox.showerror("Playback Error", "Failed to start playback")
     
@@ -625,7 +1150,6 @@ class EnhancedKaraokePlayer:
         self.audio_player.stop()
         self.play_btn.config(text="▶️ Play")
         self.status_var.set("Stopped")
-        self.current_segment = -1
         self.update_lyrics_display()
     
     def restart_playback(self):
@@ -654,7 +1178,16 @@ class EnhancedKaraokePlayer:
     
     def on_volume_change(self, value):
         """Handle volume change"""
+        # Apply only the last value of a slider drag; the macOS fallback
+        # runs osascript for every call
+        if self.volume_job:
+            self.window.after_cancel(self.volume_job)
         volume = float(value) / 100.0
+        self.volume_job = self.window.after(100, self.apply_volume, volume)
+    
+    def apply_volume(self, volume: float):
+        """Set the player volume once the slider settles"""
+        self.volume_job = None
         self.audio_player.set_volume(volume)
     
     def on_auto_scroll_change(self):
@@ -666,12 +1199,14 @@ class EnhancedKaraokePlayer:
         new_size = max(12, min(48, self.font_size + delta))
         if new_size != self.font_size:
             self.font_size = new_size
-            for label in self.lyrics_labels:
-                label.config(font=('Arial', self.font_size))
+            self.normal_font.configure(size=new_size)
+            self.bold_font.configure(size=new_size)
+            self.update_row_heights()
     
     def on_mousewheel(self, event):
         """Handle mouse wheel scrolling"""
         self.lyrics_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        self.layout_visible_rows()
     
     def toggle_fullscreen(self):
         """Toggle fullscreen mode"""
@@ -693,57 +1228,70 @@ class EnhancedKaraokePlayer:
     def update_display(self):
         """Update display elements"""
         try:
-            # Update time and progress
+            # Update time and progress, writing the Tk variables only when the
+            # displayed value changes
             current_time = self.audio_player.get_position()
             current_seconds = int(current_time)
-            self.current_time_var.set(f"{current_seconds//60:02d}:{current_seconds%60:02d}")
+            if current_seconds != self.last_second:
+                self.last_second = current_seconds
+                self.current_time_var.set(f"{current_seconds//60:02d}:{current_seconds%60:02d}")
             
             if self.audio_player.total_length > 0:
-                progress = (current_time / self.audio_player.total_length) * 100
-                self.progress_var.set(min(progress, 100))
+                progress = min(round(current_time / self.audio_player.total_length * 1000) / 10, 100)
+                if progress != self.last_progress:
+                    self.last_progress = progress
+                    self.progress_var.set(progress)
             
             # Update lyrics
             self.update_lyrics_display()
             
-            # Schedule next update
-            self.window.after(100, self.update_display)
+            # Schedule next update for when something visible changes: the next
+            # lyric boundary, clock second or progress step; slow when not playing
+            if self.audio_player.is_playing:
+                next_change = current_seconds + 1
+                i = bisect.bisect_right(self.boundaries, current_time)
+                if i < len(self.boundaries):
+                    next_change = min(next_change, self.boundaries[i])
+                if self.audio_player.total_length > 0:
+                    step = self.audio_player.total_length / 1000
+                    next_change = min(next_change, (int(current_time / step) + 1) * step)
+                delay = max(10, int((next_change - current_time) * 1000) + 1)
+            else:
+                delay = 500
+            self.update_job = self.window.after(delay, self.update_display)
             
         except tk.TclError:
             # Window was closed
             pass
     
+    def refresh_display(self):
+        """Run the display update now instead of waiting for the next scheduled one"""
+        if self.update_job is not None:
+            self.window.after_cancel(self.update_job)
+        self.update_display()
+    
     def update_lyrics_display(self):
         """Update lyrics highlighting based on current time"""
         current_time = self.audio_player.get_position()
-        new_segment = -1
         
-        # Find current segment
-        for i, segment in enumerate(self.segments):
-            if segment['start_time'] <= current_time <= segment['end_time']:
-                new_segment = i
-                break
+        # Find current segment: the last one started, if it has not ended yet
+        rank = bisect.bisect_right(self.start_times, current_time) - 1
+        if rank >= 0 and current_time <= self.end_times[rank]:
+            new_segment = self.time_order[rank]
+        else:
+            new_segment = -1
         
         # Update highlighting if segment changed
         if new_segment != self.current_segment:
-            # Remove previous highlighting
-            if 0 <= self.current_segment < len(self.lyrics_labels):
-                self.lyrics_labels[self.current_segment].config(
-                    fg='#bdc3c7', bg='#2c3e50', 
-                    font=('Arial', self.font_size)
-                )
+            previous_segment = self.current_segment
+            self.current_segment = new_segment
             
-            # Highlight current segment
-            if 0 <= new_segment < len(self.lyrics_labels):
-                self.lyrics_labels[new_segment].config(
-                    fg='#ffffff', bg='#3498db', 
-                    font=('Arial', self.font_size, 'bold')
-                )
-                
-                # Auto-scroll to current segment
-                if self.auto_scroll:
-                    self.scroll_to_segment(new_segment)
+            # Move the highlight (rows out of view are styled when recycled)
+            self.restyle_rows(previous_segment, new_segment)
             
-            self.current_segment = new_segment
+            # Auto-scroll to current segment
+            if new_segment >= 0 and self.auto_scroll:
+                self.scroll_to_segment(new_segment)
             
             # Update segment counter
             current_num = new_segment + 1 if new_segment >= 0 else 0
@@ -751,52 +1299,65 @@ class EnhancedKaraokePlayer:
     
     def scroll_to_segment(self, segment_index: int):
         """Auto-scroll to current segment"""
-        if 0 <= segment_index < len(self.lyrics_labels):
-            label = self.lyrics_labels[segment_index]
-            
-            # Calculate scroll position
-            canvas_height = self.lyrics_canvas.winfo_height()
-            frame_height = self.scrollable_frame.winfo_reqheight()
+        if 0 <= segment_index < len(self.segments):
+            frame_height = self.row_tops[-1]
             
-            if frame_height > canvas_height:
-                label_y = label.winfo_y()
-                label_height = label.winfo_reqheight()
-                
+            if frame_height > self.canvas_height:
                 # Calculate target position (center the current line)
-                target_y = label_y + label_height / 2 - canvas_height / 2
+                row_center = (self.row_tops[segment_index] + self.row_tops[segment_index + 1]) / 2
+                target_y = row_center - self.canvas_height / 2
                 scroll_fraction = max(0, min(1, target_y / frame_height))
                 
                 self.lyrics_canvas.yview_moveto(scroll_fraction)
+                self.layout_visible_rows()
     
     def create_web_player(self):
+        """Start building the web player without blocking the GUI thread"""
+        self.web_player_future = concurrent.futures.Future()
+        threading.Thread(target=self.build_web_player, args=(self.ensure_temp_dir(),),
+                         daemon=True).start()
+    
+    def ensure_temp_dir(self) -> Path:
+        """Create this player's temporary directory on first use; removed at exit"""
+        if self.temp_dir is None:
+            self.temp_dir = Path(tempfile.mkdtemp(prefix="noraemong_"))
+            atexit.register(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        return self.temp_dir
+    
+    def build_web_player(self, temp_dir: Path):
         """Create web-based karaoke player using lyrics_video_player.py approach"""
         try:
             # Import the web player module
             from lyrics_video_player import create_lyrics_video_player
             
-            # Create temporary directory for web player
-            temp_dir = tempfile.mkdtemp(prefix="noraemong_karaoke_")
-            
             # Create the web player
-            self.web_player_url = create_lyrics_video_player(
+            url = create_lyrics_video_player(
                 audio_path=self.instrumental_path,
                 sync_json_path=self.sync_json_path,
-                output_dir=temp_dir,
+                output_dir=str(temp_dir),
                 title=f"🎤 {self.song_name} - Karaoke",
                 auto_open=False,  # Don't auto-open, we'll handle it manually
                 server_port=8080
             )
             
-            print(f"🌐 Web player created: {self.web_player_url}")
+            logger.info(f"🌐 Web player created: {url}")
+            self.web_player_future.set_result(url)
             
         except Exception as e:
-            print(f"❌ Failed to create web player: {e}")
-            self.web_player_url = None
+            logger.error(f"❌ Failed to create web player: {e}")
+            self.web_player_future.set_result(None)
     
     def open_web_player(self):
         """Open web-based karaoke player"""
-        if self.web_player_url:
-            webbrowser.open(self.web_player_url)
+        url = None
+        if self.web_player_future is not None:
+            try:
+                url = self.web_player_future.result(timeout=5)
+            except concurrent.futures.TimeoutError:
+                logger.warning("⚠️ Web player is still starting, opening simple player")
+        
+        if url:
+            open_in_browser(url)
         else:
             # Fallback: create simple HTML player
             self.create_simple_web_player()
@@ -804,291 +1365,46 @@ class EnhancedKaraokePlayer:
     def create_simple_web_player(self):
         """Create a simple web player as fallback"""
         try:
-            # Create temporary HTML file
-            temp_dir = tempfile.mkdtemp(prefix="noraemong_simple_")
-            html_file = Path(temp_dir) / "karaoke.html"
-            
-            # Copy audio file to temp directory
-            audio_name = Path(self.instrumental_path).name
-            shutil.copy2(self.instrumental_path, temp_dir / audio_name)
-            
-            # Create simple HTML player
-            html_content = self.generate_simple_html_player(audio_name)
-            
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            html_file = self.simple_player_file
+            if html_file is None or not html_file.exists():
+                # Create temporary HTML file
+                temp_dir = self.ensure_temp_dir()
+                html_file = temp_dir / "karaoke.html"
+                
+                # Link the audio next to the page; copy only where links are unavailable
+                audio_name = Path(self.instrumental_path).name
+                link_or_copy(self.instrumental_path, temp_dir / audio_name)
+                
+                # Create simple HTML player
+                html_content = self.generate_simple_html_player(audio_name)
+                
+                with open(html_file, 'w', encoding='utf-8') as f:
+                    f.write(html_content)
+                self.simple_player_file = html_file
             
             # Open in browser
-            webbrowser.open(f"file://{html_file}")
-            print(f"🌐 Simple web player opened: {html_file}")
+            open_in_browser(f"file://{html_file}")
+            logger.info(f"🌐 Simple web player opened: {html_file}")
             
         except Exception as e:
-            print(f"❌ Failed to create simple web player: {e}")
+            logger.error(f"❌ Failed to create simple web player: {e}")
             messagebox.showerror("Web Player Error", f"Failed to create web player: {str(e)}")
     
     def generate_simple_html_player(self, audio_filename: str) -> str:
         """Generate simple HTML karaoke player"""
-        segments_js = json.dumps(self.segments, indent=2)
-        
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>🎤 {self.song_name} - Karaoke</title>
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            margin: 0;
-            padding: 20px;
-            color: white;
-            min-height: 100vh;
-        }}
-        
-        .container {{
-            max-width: 1000px;
-            margin: 0 auto;
-            text-align: center;
-        }}
-        
-        h1 {{
-            font-size: 2.5em;
-            margin-bottom: 30px;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
-        
-        .audio-player {{
-            background: rgba(255,255,255,0.1);
-            border-radius: 15px;
-            padding: 20px;
-            margin-bottom: 30px;
-        }}
-        
-        audio {{
-            width: 100%;
-            max-width: 600px;
-        }}
-        
-        .lyrics-display {{
-            background: rgba(255,255,255,0.1);
-            border-radius: 15px;
-            padding: 30px;
-            min-height: 400px;
-            max-height: 500px;
-            overflow-y: auto;
-        }}
-        
-        .lyric-line {{
-            margin: 15px 0;
-            padding: 15px;
-            border-radius: 8px;
-            font-size: 24px;
-            line-height: 1.5;
-            transition: all 0.3s ease;
-            cursor: pointer;
-        }}
-        
-        .lyric-line:hover {{
-            background: rgba(255,255,255,0.1);
-        }}
-        
-        .lyric-line.current {{
-            background: rgba(255,255,255,0.2);
-            transform: scale(1.02);
-            border-left: 4px solid #4ecdc4;
-            font-weight: bold;
-        }}
-        
-        .lyric-line.past {{
-            opacity: 0.6;
-        }}
-        
-        .controls {{
-            margin: 20px 0;
-        }}
-        
-        .control-btn {{
-            background: rgba(255,255,255,0.2);
-            border: 2px solid rgba(255,255,255,0.3);
-            color: white;
-            padding: 10px 20px;
-            border-radius: 25px;
-            cursor: pointer;
-            margin: 0 5px;
-            font-size: 16px;
-        }}
-        
-        .control-btn:hover {{
-            background: rgba(255,255,255,0.3);
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🎤 {self.song_name}</h1>
-        
-        <div class="audio-player">
-            <audio id="audioPlayer" controls>
-                <source src="{audio_filename}" type="audio/mpeg">
-                <source src="{audio_filename}" type="audio/wav">
-                Your browser does not support the audio element.
-            </audio>
-        </div>
-        
-        <div class="controls">
-            <button class="control-btn" onclick="toggleAutoScroll()">🔄 Auto-scroll: ON</button>
-            <button class="control-btn" onclick="changeFontSize(-2)">A-</button>
-            <button class="control-btn" onclick="changeFontSize(2)">A+</button>
-            <button class="control-btn" onclick="toggleFullscreen()">⛶ Fullscreen</button>
-        </div>
-        
-        <div class="lyrics-display" id="lyricsDisplay">
-            <!-- Lyrics will be populated by JavaScript -->
-        </div>
-    </div>
-
-    <script>
-        const segments = {segments_js};
-        const audioPlayer = document.getElementById('audioPlayer');
-        const lyricsDisplay = document.getElementById('lyricsDisplay');
-        
-        let currentSegment = -1;
-        let autoScroll = true;
-        let fontSize = 24;
-        
-        // Initialize lyrics display
-        function initLyrics() {{
-            lyricsDisplay.innerHTML = '';
-            segments.forEach((segment, index) => {{
-                const lyricDiv = document.createElement('div');
-                lyricDiv.className = 'lyric-line';
-                lyricDiv.id = `line-${{index}}`;
-                lyricDiv.textContent = segment.text;
-                lyricDiv.style.fontSize = fontSize + 'px';
-                
-                // Click to seek
-                lyricDiv.addEventListener('click', () => {{
-                    audioPlayer.currentTime = segment.start_time;
-                }});
-                
-                lyricsDisplay.appendChild(lyricDiv);
-            }});
-        }}
-        
-        // Update lyrics highlighting
-        function updateLyrics() {{
-            const currentTime = audioPlayer.currentTime;
-            let newSegment = -1;
-            
-            for (let i = 0; i < segments.length; i++) {{
-                const segment = segments[i];
-                if (currentTime >= segment.start_time && currentTime <= segment.end_time) {{
-                    newSegment = i;
-                    break;
-                }}
-            }}
-            
-            if (newSegment !== currentSegment) {{
-                // Remove previous highlighting
-                if (currentSegment >= 0) {{
-                    const prevLine = document.getElementById(`line-${{currentSegment}}`);
-                    if (prevLine) {{
-                        prevLine.classList.remove('current');
-                        prevLine.classList.add('past');
-                    }}
-                }}
-                
-                // Add current highlighting
-                if (newSegment >= 0) {{
-                    const currentLine = document.getElementById(`line-${{newSegment}}`);
-                    if (currentLine) {{
-                        currentLine.classList.add('current');
-                        currentLine.classList.remove('past');
-                        
-                        // Auto-scroll
-                        if (autoScroll) {{
-                            currentLine.scrollIntoView({{ behavior: 'smooth', block: 'center' }});
-                        }}
-                    }}
-                }}
-                
-                // Update past lines
-                for (let i = 0; i < newSegment; i++) {{
-                    const line = document.getElementById(`line-${{i}}`);
-                    if (line) {{
-                        line.classList.add('past');
-                        line.classList.remove('current');
-                    }}
-                }}
-                
-                // Update future lines
-                for (let i = newSegment + 1; i < segments.length; i++) {{
-                    const line = document.getElementById(`line-${{i}}`);
-                    if (line) {{
-                        line.classList.remove('current', 'past');
-                    }}
-                }}
-                
-                currentSegment = newSegment;
-            }}
-        }}
-        
-        // Control functions
-        function toggleAutoScroll() {{
-            autoScroll = !autoScroll;
-            const btn = event.target;
-            btn.textContent = `🔄 Auto-scroll: ${{autoScroll ? 'ON' : 'OFF'}}`;
-        }}
-        
-        function changeFontSize(delta) {{
-            fontSize = Math.max(16, Math.min(48, fontSize + delta));
-            const lines = document.querySelectorAll('.lyric-line');
-            lines.forEach(line => {{
-                line.style.fontSize = fontSize + 'px';
-            }});
-        }}
-        
-        function toggleFullscreen() {{
-            if (!document.fullscreenElement) {{
-                document.documentElement.requestFullscreen();
-            }} else {{
-                document.exitFullscreen();
-            }}
-        }}
-        
-        // Event listeners
-        audioPlayer.addEventListener('timeupdate', updateLyrics);
-        
-        // Keyboard shortcuts
-        document.addEventListener('keydown', (e) => {{
-            switch(e.code) {{
-                case 'Space':
-                    e.preventDefault();
-                    if (audioPlayer.paused) {{
-                        audioPlayer.play();
-                    }} else {{
-                        audioPlayer.pause();
-                    }}
-                    break;
-                case 'ArrowLeft':
-                    audioPlayer.currentTime = Math.max(0, audioPlayer.currentTime - 10);
-                    break;
-                case 'ArrowRight':
-                    audioPlayer.currentTime = Math.min(audioPlayer.duration, audioPlayer.currentTime + 10);
-                    break;
-                case 'F11':
-                    e.preventDefault();
-                    toggleFullscreen();
-                    break;
-            }}
-        }});
-        
-        // Initialize
-        initLyrics();
-    </script>
-</body>
-</html>"""
+        # Only the timings and text are used, as compact parallel arrays
+        dumps = lambda value: dumps_compact(value).decode('utf-8')
+        starts_js = dumps([segment['start_time'] for segment in self.segments])
+        ends_js = dumps([segment['end_time'] for segment in self.segments])
+        texts_js = dumps([segment['text'] for segment in self.segments])
+        
+        return SIMPLE_PLAYER_TEMPLATE.safe_substitute(
+            song_name=html.escape(self.song_name),
+            audio_filename=html.escape(audio_filename),
+            starts_js=starts_js,
+            ends_js=ends_js,
+            texts_js=texts_js
+        )
     
     def show(self):
         """Show the karaoke player window"""
@@ -1098,25 +1414,31 @@ class EnhancedKaraokePlayer:
         """Cleanup resources"""
         try:
             self.audio_player.stop()
-            pygame.mixer.quit()
+            self.audio_player.close()
             
             # Clean up temporary audio file if exists
             if hasattr(self.audio_player, 'temp_audio_file'):
-                try:
-                    import os
+                with contextlib.suppress(OSError):
                     os.unlink(self.audio_player.temp_audio_file)
-                except:
-                    pass
-        except:
-            pass
+            
+            if self.temp_dir is not None:
+                shutil.rmtree(self.temp_dir, ignore_errors=True)
+                self.temp_dir = None
+        except Exception as e:
+            logger.warning(f"⚠️ Cleanup failed: {e}")
 
 # Integration function for the main GUI
 def launch_enhanced_karaoke_player(instrumental_path: str, sync_json_path: str, song_name: str):
     """Launch the enhanced karaoke player"""
+    if not PYGAME_AVAILABLE:
+        # Fallback if pygame not available
+        logger.warning("⚠️ pygame not available, launching basic player...")
+        from karaoke_player import KaraokePlayer
+        player = KaraokePlayer(instrumental_path, sync_json_path, song_name)
+        player.show()
+        return
+    
     try:
-        # Try to import pygame
-        import pygame
-        
         # Create and show player
         player = EnhancedKaraokePlayer(
             instrumental_path=instrumental_path,
@@ -1133,12 +1455,6 @@ def launch_enhanced_karaoke_player(instrumental_path: str, sync_json_path: str,
         player.window.protocol("WM_DELETE_WINDOW", on_closing)
         player.show()
         
-    except ImportError:
-        # Fallback if pygame not available
-        print("⚠️ pygame not available, launching basic player...")
-        from karaoke_player import KaraokePlayer
-        player = KaraokePlayer(instrumental_path, sync_json_path, song_name)
-        player.show()
     except Exception as e:
         raise Exception(f"Failed to launch karaoke player: {str(e)}")
 
@@ -1146,6 +1462,8 @@ def main():
     """Test the enhanced karaoke player"""
     import sys
     
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     if len(sys.argv) < 4:
         print("Usage: python karaoke_player.py <instrumental.wav> <sync.json> <song_name>")
         return
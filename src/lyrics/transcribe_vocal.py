@@ -3,6 +3,7 @@
 import time
 import json
 import os
+import functools
 from pathlib import Path
 import argparse
 from typing import List, Dict, Optional, Tuple
@@ -13,14 +14,28 @@ import unicodedata
 
 # Audio processing and speech recognition
 from faster_whisper import WhisperModel
+import ctranslate2
 
-# Text processing for lyrics alignment
+# 배치 추론 파이프라인 (faster-whisper 1.1 이상)
 try:
-    from fuzzywuzzy import fuzz, process
+    from faster_whisper import BatchedInferencePipeline
+    BATCHED_AVAILABLE = True
 except ImportError:
-    print("⚠️  fuzzywuzzy not installed. Installing...")
-    os.system("pip install fuzzywuzzy python-levenshtein")
-    from fuzzywuzzy import fuzz, process
+    BATCHED_AVAILABLE = False
+
+# Text processing for lyrics alignment: rapidfuzz (C++ bit-parallel) first,
+# fuzzywuzzy otherwise. Both score 0-100 with the same scorer names.
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    try:
+        from fuzzywuzzy import fuzz, process
+    except ImportError:
+        print("⚠️  fuzzywuzzy not installed. Installing...")
+        os.system("pip install fuzzywuzzy python-levenshtein")
+        from fuzzywuzzy import fuzz, process
 
 @dataclass
 class LyricSegment:
@@ -31,49 +46,51 @@ class LyricSegment:
     confidence: float = 0.0
     word_timings: Optional[List[Dict]] = None
 
+@functools.lru_cache(maxsize=2)
+def load_whisper_model(model_size: str, device: str, compute_type: str) -> WhisperModel:
+    """Whisper 모델을 로드합니다. 같은 설정으로 다시 요청하면 이미 로드한 모델을 재사용합니다."""
+    # 라이브러리 기본값(4 스레드) 대신 모든 코어로 CPU 연산을 돌립니다
+    return WhisperModel(model_size, device=device, compute_type=compute_type,
+                        cpu_threads=os.cpu_count() or 4)
+
 def format_time(seconds: float) -> str:
     """초를 SRT 타임스탬프 형식(HH:MM:SS,ms)으로 변환합니다."""
-    milliseconds = round(seconds * 1000.0)
-    hours = milliseconds // 3_600_000
-    milliseconds %= 3_600_000
-    minutes = milliseconds // 60_000
-    milliseconds %= 60_000
-    seconds = milliseconds // 1_000
-    milliseconds %= 1_000
+    seconds, milliseconds = divmod(round(seconds * 1000.0), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
     return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
 
-def save_as_srt(segments: List[LyricSegment], output_path: Path):
-    """추출된 세그먼트를 .srt 자막 파일 형식으로 저장합니다."""
-    with open(output_path, 'w', encoding='utf-8') as srt_file:
-        for i, segment in enumerate(segments):
-            start = format_time(segment.start_time)
-            end = format_time(segment.end_time)
-            text = segment.text.strip()
-            
-            srt_file.write(f"{i + 1}\n")
-            srt_file.write(f"{start} --> {end}\n")
-            srt_file.write(f"{text}\n\n")
-    print(f"🎬 SRT 자막 파일 저장 완료: {output_path}")
-
-def save_as_txt(segments: List[LyricSegment], output_path: Path):
-    """추출된 텍스트를 .txt 파일 형식으로 저장합니다."""
-    with open(output_path, 'w', encoding='utf-8') as txt_file:
-        for segment in segments:
-            txt_file.write(segment.text.strip() + "\n")
-    print(f"📄 일반 텍스트 파일 저장 완료: {output_path}")
+def save_as_txt_and_srt(segments: List[LyricSegment], txt_path: Path, srt_path: Path):
+    """세그먼트를 한 번만 순회하며 .txt 텍스트와 .srt 자막 파일을 함께 저장합니다."""
+    txt_lines = []
+    srt_blocks = []
+    for i, segment in enumerate(segments, 1):
+        text = segment.text.strip()
+        start = format_time(segment.start_time)
+        end = format_time(segment.end_time)
+        
+        txt_lines.append(f"{text}\n")
+        srt_blocks.append(f"{i}\n{start} --> {end}\n{text}\n\n")
+    
+    # 파일마다 한 번에 씁니다
+    Path(txt_path).write_text("".join(txt_lines), encoding='utf-8')
+    print(f"📄 일반 텍스트 파일 저장 완료: {txt_path}")
+    Path(srt_path).write_text("".join(srt_blocks), encoding='utf-8')
+    print(f"🎬 SRT 자막 파일 저장 완료: {srt_path}")
 
 def save_as_lrc(segments: List[LyricSegment], output_path: Path):
     """추출된 세그먼트를 .lrc 가사 파일 형식으로 저장합니다."""
-    with open(output_path, 'w', encoding='utf-8') as lrc_file:
-        lrc_file.write("[ar:Generated by AI Transcription]\n")
-        lrc_file.write("[ti:Synchronized Lyrics]\n")
-        lrc_file.write("[by:AI Lyrics Sync]\n\n")
-        
-        for segment in segments:
-            minutes = int(segment.start_time // 60)
-            seconds = segment.start_time % 60
-            timestamp = f"[{minutes:02d}:{seconds:05.2f}]"
-            lrc_file.write(f"{timestamp}{segment.text}\n")
+    lines = [
+        "[ar:Generated by AI Transcription]\n",
+        "[ti:Synchronized Lyrics]\n",
+        "[by:AI Lyrics Sync]\n\n"
+    ]
+    for segment in segments:
+        minutes = int(segment.start_time // 60)
+        seconds = segment.start_time % 60
+        lines.append(f"[{minutes:02d}:{seconds:05.2f}]{segment.text}\n")
+    
+    Path(output_path).write_text("".join(lines), encoding='utf-8')
     print(f"🎵 LRC 가사 파일 저장 완료: {output_path}")
 
 def save_as_json(segments: List[LyricSegment], output_path: Path):
@@ -177,36 +194,80 @@ class LyricsProcessor:
 class AudioTranscriber:
     """오디오 전사 및 가사 동기화를 처리합니다."""
     
-    def __init__(self, model_size: str = "base", device: str = "auto"):
+    # 보컬 트랙의 긴 무음 구간은 Silero VAD로 건너뜁니다 (타임스탬프는 원본 기준 유지)
+    VAD_PARAMETERS = dict(min_silence_duration_ms=500, speech_pad_ms=200)
+    
+    def __init__(self, model_size: str = "base", device: str = "auto", beam_size: int = 1,
+                 compute_type: str = "default", batch_size: Optional[int] = None):
         self.model_size = model_size
         self.device = device
+        self.compute_type = compute_type
+        self.beam_size = beam_size  # 1 = 그리디 디코딩 (빔 탐색 대비 디코더 연산 약 1/5)
+        self.batch_size = batch_size  # None = GPU에서 16, CPU에서는 배치 없음
         self.model = None
+        self.pipeline = None
         self.lyrics_processor = LyricsProcessor()
         self._load_model()
     
     def _load_model(self):
         """Whisper 모델을 로드합니다."""
-        print(f"📥 Whisper 모델 로딩 중: {self.model_size}")
+        compute_type = self._resolve_compute_type()
+        print(f"📥 Whisper 모델 로딩 중: {self.model_size} ({compute_type})")
         try:
-            self.model = WhisperModel(self.model_size, device=self.device)
+            self.model = load_whisper_model(self.model_size, self.device, compute_type)
+            if self.batch_size is None:
+                self.batch_size = 16 if self._uses_cuda() else 0
+            if self.batch_size > 1 and BATCHED_AVAILABLE:
+                # 여러 30초 구간을 한 번에 인코딩해 GPU를 채웁니다
+                self.pipeline = BatchedInferencePipeline(model=self.model)
             print("✅ Whisper 모델 로드 완료")
         except Exception as e:
             print(f"❌ Whisper 모델 로드 실패: {e}")
             raise
     
+    def _resolve_compute_type(self) -> str:
+        """연산 타입을 정합니다. 기본값은 GPU에서 int8 가중치 + fp16 연산, CPU에서 int8입니다."""
+        if self.compute_type != "default":
+            return self.compute_type
+        # 장치가 실제로 지원하는 타입 중 가장 빠른 것을 고릅니다
+        # int8 가중치는 GPU에서 fp16 대비 가중치 대역폭을 절반으로, CPU에서 fp32 대비 1/4로 줄입니다
+        device = "cuda" if self._uses_cuda() else "cpu"
+        # bf16은 Ampere 이상에서만 지원되며, fp16과 속도는 같고 범위가 넓어 오버플로가 없습니다
+        preferred = (("int8_bfloat16", "int8_float16", "float16") if device == "cuda"
+                     else ("int8", "float32"))
+        supported = ctranslate2.get_supported_compute_types(device)
+        return next((t for t in preferred if t in supported), "default")
+    
+    def _uses_cuda(self) -> bool:
+        """모델이 CUDA 장치에서 실행되는지 확인합니다."""
+        return self.device == "cuda" or (self.device == "auto" and ctranslate2.get_cuda_device_count() > 0)
+    
+    def _transcribe(self, audio_path: str, language: Optional[str] = None, word_timestamps: bool = True):
+        """faster-whisper로 전사합니다. 배치 파이프라인이 있으면 사용합니다."""
+        options = dict(
+            beam_size=self.beam_size,
+            word_timestamps=word_timestamps,
+            vad_filter=True,
+            vad_parameters=dict(self.VAD_PARAMETERS),  # 배치 파이프라인이 딕셔너리를 수정하므로 복사
+            language=language
+        )
+        if self.pipeline is not None:
+            return self.pipeline.transcribe(audio_path, batch_size=self.batch_size, **options)
+        return self.model.transcribe(audio_path, **options)
+    
     def transcribe_with_timestamps(self, audio_path: str, language: Optional[str] = None) -> List[LyricSegment]:
         """오디오를 전사하고 타임스탬프와 함께 LyricSegment로 반환합니다."""
+        return list(self.iter_segments(audio_path, language))
+    
+    def iter_segments(self, audio_path: str, language: Optional[str] = None, word_timestamps: bool = True):
+        """디코더가 구간을 끝낼 때마다 LyricSegment를 하나씩 내보냅니다."""
+        # 텍스트만 필요하면 word_timestamps=False로 단어 정렬 단계를 건너뜁니다
         print(f"🎤 오디오 전사 중: {Path(audio_path).name}")
         
         try:
-            segments, info = self.model.transcribe(
-                audio_path,
-                beam_size=5,
-                word_timestamps=True,
-                language=language
-            )
+            segments, info = self._transcribe(audio_path, language, word_timestamps)
             
-            segment_list = []
+            count = 0
             for segment in segments:
                 word_timings = []
                 if hasattr(segment, 'words') and segment.words:
@@ -219,20 +280,18 @@ class AudioTranscriber:
                         }
                         word_timings.append(word_data)
                 
-                lyric_segment = LyricSegment(
+                count += 1
+                yield LyricSegment(
                     start_time=segment.start,
                     end_time=segment.end,
                     text=segment.text.strip(),
                     confidence=1.0,  # 전사된 텍스트는 높은 신뢰도
                     word_timings=word_timings if word_timings else None
                 )
-                segment_list.append(lyric_segment)
             
-            print(f"✅ 전사 완료: {len(segment_list)} 세그먼트")
+            print(f"✅ 전사 완료: {count} 세그먼트")
             print(f"🌍 감지된 언어: {info.language} (확률: {info.language_probability:.2f})")
             
-            return segment_list
-            
         except Exception as e:
             print(f"❌ 전사 실패: {e}")
             raise
@@ -263,12 +322,7 @@ class AudioTranscriber:
     
     def _transcribe_for_alignment(self, audio_path: str, language: Optional[str] = None) -> List[Dict]:
         """정렬을 위한 오디오 전사 (딕셔너리 형태로 반환)"""
-        segments, info = self.model.transcribe(
-            audio_path,
-            beam_size=5,
-            word_timestamps=True,
-            language=language
-        )
+        segments, info = self._transcribe(audio_path, language)
         
         segment_list = []
         for segment in segments:
@@ -408,93 +462,96 @@ class AudioTranscriber:
                     best_indices = list(range(start_idx, start_idx + window_size))
         
         return best_match, best_score, best_indices
-    parser = argparse.ArgumentParser(description="faster-whisper를 사용하여 오디오 파일에서 텍스트를 추출합니다.")
-    parser.add_argument("audio_file", type=str, help="텍스트를 추출할 오디오 파일 경로")
-    parser.add_argument("--model_size", type=str, default="large-v3", help="사용할 Whisper 모델 크기 (예: tiny, base, small, medium, large-v3)")
-    parser.add_argument("--device", type=str, default="auto", choices=["auto", "cpu", "cuda"], help="사용할 장치 (auto, cpu, cuda)")
-    parser.add_argument("--compute_type", type=str, default="default", choices=["default", "int8", "float16"], help="연산 타입 (메모리 및 속도 최적화)")
-    parser.add_argument("--language", type=str, default=None, help="오디오의 언어 코드 (예: ko, en). 지정 시 언어 감지 과정을 생략하여 더 빠름.")
-    
+
 def transcribe_and_sync():
     """통합된 전사 및 동기화 함수"""
     parser = argparse.ArgumentParser(description="faster-whisper를 사용하여 오디오에서 텍스트를 추출하고 가사와 동기화합니다.")
-    parser.add_argument("audio_file", type=str, help="처리할 오디오 파일 경로")
+    parser.add_argument("audio_files", type=str, nargs="+", help="처리할 오디오 파일 경로 (여러 개 지정 시 모델을 한 번만 로드)")
     parser.add_argument("--lyrics_file", type=str, default=None, help="동기화할 가사 파일 경로 (선택사항)")
     parser.add_argument("--model_size", type=str, default="large-v3", help="사용할 Whisper 모델 크기")
     parser.add_argument("--device", type=str, default="auto", choices=["auto", "cpu", "cuda"], help="사용할 장치")
-    parser.add_argument("--compute_type", type=str, default="default", choices=["default", "int8", "float16"], help="연산 타입")
+    parser.add_argument("--compute_type", type=str, default="default", choices=["default", "int8", "int8_float32", "int8_float16", "int8_bfloat16", "float16", "bfloat16", "float32"], help="연산 타입 (기본값: GPU에서는 int8_bfloat16/int8_float16, CPU에서는 int8)")
     parser.add_argument("--language", type=str, default=None, help="오디오의 언어 코드")
+    parser.add_argument("--batch_size", type=int, default=None, help="한 번에 디코딩할 구간 수 (기본값: GPU 16, CPU 배치 없음)")
+    parser.add_argument("--beam_size", type=int, default=1, help="빔 탐색 크기 (1은 그리디 디코딩, 정확도를 조금 더 원하면 5)")
     parser.add_argument("--similarity_threshold", type=float, default=0.6, help="텍스트 매칭을 위한 최소 유사도")
     parser.add_argument("--output_dir", type=str, default=None, help="출력 디렉토리 (기본값: 오디오 파일과 같은 위치)")
     
     args = parser.parse_args()
 
-    audio_path = Path(args.audio_file)
-    if not audio_path.exists():
-        print(f"❌ 오류: 파일을 찾을 수 없습니다 -> {audio_path}")
-        return
-
-    # 출력 디렉토리 설정
-    if args.output_dir:
-        output_dir = Path(args.output_dir)
-    else:
-        output_dir = audio_path.parent
+    if args.lyrics_file and len(args.audio_files) > 1:
+        parser.error("--lyrics_file은 오디오 파일 하나에만 사용할 수 있습니다")
     
-    output_dir.mkdir(exist_ok=True)
-    output_basename = output_dir / audio_path.stem
+    audio_paths = [Path(audio_file) for audio_file in args.audio_files]
+    for audio_path in audio_paths:
+        if not audio_path.exists():
+            print(f"❌ 오류: 파일을 찾을 수 없습니다 -> {audio_path}")
+            return
 
     print("="*60)
     if args.lyrics_file:
-        print(f"🎵 가사 동기화 모드: {audio_path.name}")
+        print(f"🎵 가사 동기화 모드: {audio_paths[0].name}")
         print(f"가사 파일: {args.lyrics_file}")
     else:
-        print(f"🎤 오디오 전사 모드: {audio_path.name}")
+        print(f"🎤 오디오 전사 모드: {', '.join(p.name for p in audio_paths)}")
     print(f"모델: {args.model_size}, 장치: {args.device}, 연산 타입: {args.compute_type}")
     print("="*60)
 
     try:
-        # 전사기 초기화
+        # 전사기 초기화 (모든 파일이 같은 모델을 사용)
         transcriber = AudioTranscriber(
             model_size=args.model_size, 
-            device=args.device
+            device=args.device,
+            beam_size=args.beam_size,
+            compute_type=args.compute_type,
+            batch_size=args.batch_size
         )
         
-        start_time = time.perf_counter()
-        
-        if args.lyrics_file:
-            # 가사 동기화 모드
-            if not Path(args.lyrics_file).exists():
-                print(f"❌ 가사 파일을 찾을 수 없습니다: {args.lyrics_file}")
-                return
+        for audio_path in audio_paths:
+            # 출력 디렉토리 설정
+            if args.output_dir:
+                output_dir = Path(args.output_dir)
+            else:
+                output_dir = audio_path.parent
             
-            segments = transcriber.align_lyrics_with_audio(
-                str(audio_path), 
-                args.lyrics_file,
-                language=args.language,
-                similarity_threshold=args.similarity_threshold
-            )
+            output_dir.mkdir(exist_ok=True)
+            output_basename = output_dir / audio_path.stem
             
-            # 동기화 결과 요약
-            print_sync_summary(segments)
+            start_time = time.perf_counter()
             
-        else:
-            # 순수 전사 모드
-            segments = transcriber.transcribe_with_timestamps(
-                str(audio_path), 
-                language=args.language
-            )
-        
-        end_time = time.perf_counter()
-        
-        print(f"\n⏱️ 처리 완료! (소요 시간: {end_time - start_time:.2f}초)")
-        
-        # 다양한 형식으로 결과 저장
-        save_as_txt(segments, output_basename.with_suffix(".txt"))
-        save_as_srt(segments, output_basename.with_suffix(".srt"))
-        save_as_lrc(segments, output_basename.with_suffix(".lrc"))
-        save_as_json(segments, output_basename.with_suffix(".json"))
-        
-        print(f"\n🎉 모든 파일이 저장되었습니다: {output_dir}")
+            if args.lyrics_file:
+                # 가사 동기화 모드
+                if not Path(args.lyrics_file).exists():
+                    print(f"❌ 가사 파일을 찾을 수 없습니다: {args.lyrics_file}")
+                    return
+                
+                segments = transcriber.align_lyrics_with_audio(
+                    str(audio_path), 
+                    args.lyrics_file,
+                    language=args.language,
+                    similarity_threshold=args.similarity_threshold
+                )
+                
+                # 동기화 결과 요약
+                print_sync_summary(segments)
+                
+            else:
+                # 순수 전사 모드
+                segments = transcriber.transcribe_with_timestamps(
+                    str(audio_path), 
+                    language=args.language
+                )
+            
+            end_time = time.perf_counter()
+            
+            print(f"\n⏱️ 처리 완료! (소요 시간: {end_time - start_time:.2f}초)")
+            
+            # 다양한 형식으로 결과 저장
+            save_as_txt_and_srt(segments, output_basename.with_suffix(".txt"), output_basename.with_suffix(".srt"))
+            save_as_lrc(segments, output_basename.with_suffix(".lrc"))
+            save_as_json(segments, output_basename.with_suffix(".json"))
+            
+            print(f"\n🎉 모든 파일이 저장되었습니다: {output_dir}")
 
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
@@ -10,8 +10,10 @@ import os
 import time
 import json
 import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional, Union
+from typing import List, Dict, Tuple, Optional, Union, Iterable
 import difflib
 import re
 from dataclasses import dataclass
@@ -19,6 +21,8 @@ from dataclasses import dataclass
 # Audio processing and speech recognition
 try:
     from faster_whisper import WhisperModel
+    import ctranslate2
+    import numpy as np
     import torch
     import torchaudio
 except ImportError as e:
@@ -28,7 +32,25 @@ except ImportError as e:
 
 # Text processing
 import unicodedata
-from fuzzywuzzy import fuzz, process
+
+# Fuzzy matching: rapidfuzz (C++) when available, fuzzywuzzy otherwise.
+# Both score 0-100 with the same scorer names.
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    from fuzzywuzzy import fuzz, process
+    RAPIDFUZZ_AVAILABLE = False
+
+# orjson writes indented JSON several times faster than the stdlib when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Longest run of consecutive transcription segments one lyric line may span
+MAX_SEGMENTS_PER_LINE = 4
 
 @dataclass
 class LyricSegment:
@@ -42,6 +64,11 @@ class LyricSegment:
 class LyricsProcessor:
     """Handles lyrics/transcript file processing and normalization."""
     
+    # Anything that is neither a word character nor whitespace (all Unicode punctuation)
+    NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+    # LRC timestamp tag [mm:ss.xx]
+    LRC_TIMESTAMP_PATTERN = re.compile(r'\[\d+:\d+\.\d+\]')
+    
     def __init__(self):
         self.line_separators = ['\n', '\r\n', '\r']
         
@@ -59,43 +86,28 @@ class LyricsProcessor:
         if not file_path.exists():
             raise FileNotFoundError(f"Lyrics file not found: {file_path}")
             
+        # Parsers read the open file line by line instead of a copy of its contents
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        if file_path.suffix.lower() == '.lrc':
-            return self._parse_lrc_text(content)
-        elif file_path.suffix.lower() == '.srt':
-            return self._parse_srt_text(content)
-        else:
-            return self._parse_plain_text(content)
+            if file_path.suffix.lower() == '.lrc':
+                return self._parse_lrc_text(f)
+            elif file_path.suffix.lower() == '.srt':
+                return self._parse_srt_text(f)
+            else:
+                return self._parse_plain_text(f)
     
-    def _parse_plain_text(self, content: str) -> List[str]:
+    def _parse_plain_text(self, lines: Iterable[str]) -> List[str]:
         """Parse plain text lyrics."""
-        lines = content.split('\n')
         # Filter out empty lines and clean whitespace
-        lyrics = [line.strip() for line in lines if line.strip()]
+        lyrics = [line for line in (line.strip() for line in lines) if line]
         return lyrics
     
-    def _parse_lrc_text(self, content: str) -> List[str]:
+    def _parse_lrc_text(self, lines: Iterable[str]) -> List[str]:
         """Extract text from LRC format, ignoring timestamps."""
-        lines = content.split('\n')
-        lyrics = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Remove LRC timestamp format [mm:ss.xx]
-            text = re.sub(r'\[\d+:\d+\.\d+\]', '', line).strip()
-            if text:
-                lyrics.append(text)
-                
-        return lyrics
+        # Remove LRC timestamps [mm:ss.xx], then keep the non-empty lines
+        return self._parse_plain_text(self.LRC_TIMESTAMP_PATTERN.sub('', line) for line in lines)
     
-    def _parse_srt_text(self, content: str) -> List[str]:
+    def _parse_srt_text(self, lines: Iterable[str]) -> List[str]:
         """Extract text from SRT format, ignoring timestamps."""
-        lines = content.split('\n')
         lyrics = []
         
         for line in lines:
@@ -109,49 +121,73 @@ class LyricsProcessor:
             
         return lyrics
     
-    def normalize_text(self, text: str) -> str:
-        """Normalize text for better matching."""
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove extra whitespace
-        text = ' '.join(text.split())
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def normalize_text(text: str) -> str:
+        """Normalize text for better matching (cached: choruses repeat lines verbatim)."""
+        # Lowercase and remove punctuation but keep word boundaries
+        text = LyricsProcessor.NON_WORD_PATTERN.sub(' ', text.lower())
         
-        # Remove punctuation but keep word boundaries
-        text = re.sub(r'[^\w\s]', ' ', text)
+        # Collapse the whitespace left behind in one pass
         text = ' '.join(text.split())
         
-        # Normalize unicode characters
-        text = unicodedata.normalize('NFKD', text)
+        # Normalize unicode characters (ASCII is already in NFKD form)
+        if not text.isascii():
+            text = unicodedata.normalize('NFKD', text)
         
         return text
 
 class AudioTranscriber:
     """Handles audio transcription with word-level timestamps."""
     
-    def __init__(self, model_size: str = "base", device: str = "auto"):
+    # Silence shorter than this stays in the audio; long intros, outros and breaks are cut
+    VAD_PARAMETERS = dict(min_silence_duration_ms=500)
+    
+    def __init__(self, model_size: str = "base", device: str = "auto", compute_type: str = "default",
+                 beam_size: int = 1, vad_filter: bool = True):
         """
         Initialize the transcriber.
         
         Args:
             model_size: Whisper model size ("tiny", "base", "small", "medium", "large-v3")
             device: Device to use ("auto", "cpu", "cuda")
+            compute_type: CTranslate2 compute type; "default" picks int8 on CPU and
+                int8_bfloat16 (Ampere+) or int8_float16 on CUDA
+            beam_size: Decoder beam width; greedy decoding (1) is several times faster than 5
+            vad_filter: Skip silent stretches before they reach the encoder
         """
         self.model_size = model_size
         self.device = device
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+        self.vad_filter = vad_filter
         self.model = None
         self._load_model()
     
     def _load_model(self):
         """Load the Whisper model."""
-        print(f"📥 Loading Whisper model: {self.model_size}")
+        compute_type = self._resolve_compute_type()
+        print(f"📥 Loading Whisper model: {self.model_size} ({compute_type})")
         try:
-            self.model = WhisperModel(self.model_size, device=self.device)
+            self.model = WhisperModel(self.model_size, device=self.device, compute_type=compute_type,
+                                      cpu_threads=os.cpu_count() or 4)
             print("✅ Whisper model loaded successfully")
         except Exception as e:
             print(f"❌ Failed to load Whisper model: {e}")
             raise
     
+    def _resolve_compute_type(self) -> str:
+        """Pick the fastest quantized compute type the device supports unless one was given."""
+        if self.compute_type != "default":
+            return self.compute_type
+        # int8 weights halve weight traffic against fp16 on GPU and quarter it against fp32 on CPU
+        use_cuda = self.device == "cuda" or (self.device == "auto" and ctranslate2.get_cuda_device_count() > 0)
+        device = "cuda" if use_cuda else "cpu"
+        # bf16 (Ampere and newer) runs as fast as fp16 but keeps fp32's exponent range
+        preferred = ("int8_bfloat16", "int8_float16", "float16") if use_cuda else ("int8", "float32")
+        supported = ctranslate2.get_supported_compute_types(device)
+        return next((t for t in preferred if t in supported), "default")
+    
     def transcribe_with_timestamps(self, audio_path: str, language: Optional[str] = None) -> List[Dict]:
         """
         Transcribe audio with word-level timestamps.
@@ -159,19 +195,25 @@ class AudioTranscriber:
         Returns:
             List of segments with detailed timing information
         """
+        return list(self.iter_segments(audio_path, language))
+    
+    def iter_segments(self, audio_path: str, language: Optional[str] = None):
+        """Yield each segment as soon as the decoder finishes it."""
         print(f"🎤 Transcribing audio: {Path(audio_path).name}")
         
         try:
             # Transcribe with word timestamps
             segments, info = self.model.transcribe(
                 audio_path,
-                beam_size=5,
+                beam_size=self.beam_size,
                 word_timestamps=True,
-                language=language
+                language=language,
+                vad_filter=self.vad_filter,
+                vad_parameters=dict(self.VAD_PARAMETERS)
             )
             
-            # Convert to list and extract detailed information
-            segment_list = []
+            # Extract detailed information as segments are decoded
+            count = 0
             for segment in segments:
                 segment_data = {
                     'start': segment.start,
@@ -191,13 +233,12 @@ class AudioTranscriber:
                         }
                         segment_data['words'].append(word_data)
                 
-                segment_list.append(segment_data)
+                count += 1
+                yield segment_data
             
-            print(f"✅ Transcription complete: {len(segment_list)} segments")
+            print(f"✅ Transcription complete: {count} segments")
             print(f"🌍 Detected language: {info.language} (confidence: {info.language_probability:.2f})")
             
-            return segment_list
-            
         except Exception as e:
             print(f"❌ Transcription failed: {e}")
             raise
@@ -205,16 +246,20 @@ class AudioTranscriber:
 class LyricsSynchronizer:
     """Main class for synchronizing lyrics with audio timestamps."""
     
-    def __init__(self, model_size: str = "base", device: str = "auto"):
+    def __init__(self, model_size: str = "base", device: str = "auto", compute_type: str = "default",
+                 beam_size: int = 1, vad_filter: bool = True):
         """
         Initialize the synchronizer.
         
         Args:
             model_size: Whisper model size for transcription
             device: Device to use for processing
+            compute_type: CTranslate2 compute type for the Whisper model
+            beam_size: Decoder beam width for transcription
+            vad_filter: Skip silence before transcription
         """
         self.lyrics_processor = LyricsProcessor()
-        self.transcriber = AudioTranscriber(model_size, device)
+        self.transcriber = AudioTranscriber(model_size, device, compute_type, beam_size, vad_filter)
         
     def align_lyrics(self, audio_path: str, lyrics_path: str, 
                     language: Optional[str] = None,
@@ -238,16 +283,26 @@ class LyricsSynchronizer:
         lyrics_lines = self.lyrics_processor.load_lyrics_file(lyrics_path)
         print(f"✅ Loaded {len(lyrics_lines)} lyric lines")
         
-        # Step 2: Transcribe audio with timestamps
+        # Step 2: Transcribe audio with timestamps. CTranslate2 releases the GIL,
+        # so the lyrics are normalized on a worker thread in the meantime, and
+        # each segment is normalized as soon as it is decoded.
         print("🎤 Transcribing audio...")
-        transcription_segments = self.transcriber.transcribe_with_timestamps(
-            audio_path, language
-        )
+        transcription_segments = []
+        normalized_segments = []
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            lyrics_future = executor.submit(
+                lambda: [self.lyrics_processor.normalize_text(line) for line in lyrics_lines]
+            )
+            for segment in self.transcriber.iter_segments(audio_path, language):
+                transcription_segments.append(segment)
+                normalized_segments.append(self.lyrics_processor.normalize_text(segment['text']))
+            normalized_lyrics = lyrics_future.result()
         
         # Step 3: Align lyrics with transcription
         print("🔄 Aligning lyrics with audio...")
         aligned_segments = self._align_text_with_timestamps(
-            lyrics_lines, transcription_segments, similarity_threshold
+            lyrics_lines, transcription_segments, similarity_threshold,
+            normalized_lyrics, normalized_segments
         )
         
         print(f"✅ Synchronization complete: {len(aligned_segments)} segments aligned")
@@ -255,74 +310,62 @@ class LyricsSynchronizer:
     
     def _align_text_with_timestamps(self, lyrics_lines: List[str], 
                                    transcription_segments: List[Dict],
-                                   similarity_threshold: float) -> List[LyricSegment]:
+                                   similarity_threshold: float,
+                                   normalized_lyrics: Optional[List[str]] = None,
+                                   normalized_segments: Optional[List[str]] = None) -> List[LyricSegment]:
         """
         Align lyrics text with transcription timestamps using fuzzy matching.
+        
+        Lyrics and transcription segments are both in sung order, so the alignment
+        is one monotonic dynamic program over the lyric x segment score matrix:
+        each lyric takes 1-4 consecutive segments (or none), and the total
+        similarity of the matched lines is maximized.
+        
+        normalized_lyrics and normalized_segments may be passed in when the text
+        was already normalized.
         """
         aligned_segments = []
         
         # Normalize all text for better matching
-        normalized_lyrics = [
-            self.lyrics_processor.normalize_text(line) for line in lyrics_lines
-        ]
-        
-        # Create a combined transcription text for global alignment
-        transcription_text = " ".join([
-            self.lyrics_processor.normalize_text(seg['text']) 
-            for seg in transcription_segments
-        ])
-        
-        # Track which transcription segments have been used
-        used_segments = set()
-        
-        for i, (original_lyric, normalized_lyric) in enumerate(zip(lyrics_lines, normalized_lyrics)):
-            best_match = None
-            best_score = 0
-            best_segment_indices = []
-            
-            # Try to find the best matching segment(s) for this lyric line
-            for j, segment in enumerate(transcription_segments):
-                if j in used_segments:
-                    continue
-                    
-                normalized_segment = self.lyrics_processor.normalize_text(segment['text'])
-                
-                # Calculate similarity using multiple methods
-                similarity_ratio = fuzz.ratio(normalized_lyric, normalized_segment) / 100.0
-                partial_ratio = fuzz.partial_ratio(normalized_lyric, normalized_segment) / 100.0
-                token_ratio = fuzz.token_sort_ratio(normalized_lyric, normalized_segment) / 100.0
+        if normalized_lyrics is None:
+            normalized_lyrics = [
+                self.lyrics_processor.normalize_text(line) for line in lyrics_lines
+            ]
+        
+        if normalized_segments is None:
+            normalized_segments = [
+                self.lyrics_processor.normalize_text(seg['text']) 
+                for seg in transcription_segments
+            ]
+        
+        # Runs of consecutive segments and their endpoint timing assume time order;
+        # Whisper emits that already, so the sort only runs for out-of-order input
+        if any(later['start'] < earlier['start']
+               for earlier, later in zip(transcription_segments, transcription_segments[1:])):
+            order = sorted(range(len(transcription_segments)),
+                           key=lambda j: transcription_segments[j]['start'])
+            transcription_segments = [transcription_segments[j] for j in order]
+            normalized_segments = [normalized_segments[j] for j in order]
+        
+        # Runs below the threshold can never be matched, so rapidfuzz may give up
+        # on them early; the small margin keeps float rounding at the boundary exact
+        group_scores = self._group_scores(normalized_lyrics, normalized_segments,
+                                          score_cutoff=max(similarity_threshold * 100 - 0.01, 0))
+        matches = self._best_alignment(group_scores, len(normalized_lyrics),
+                                       len(normalized_segments), similarity_threshold)
+        
+        # Per-line results are printed together once the loop is done
+        status_lines = []
+        for original_lyric, match in zip(lyrics_lines, matches):
+            if match is not None:
+                start_idx, window_size, best_score = match
+                best_match = transcription_segments[start_idx:start_idx + window_size]
                 
-                # Use the best similarity score
-                score = max(similarity_ratio, partial_ratio, token_ratio)
-                
-                if score > best_score and score >= similarity_threshold:
-                    best_score = score
-                    best_match = segment
-                    best_segment_indices = [j]
-            
-            # If no good single match, try combining adjacent segments
-            if best_score < similarity_threshold:
-                best_match, best_score, best_segment_indices = self._find_multi_segment_match(
-                    normalized_lyric, transcription_segments, used_segments, similarity_threshold
-                )
-            
-            # Create aligned segment
-            if best_match and best_score >= similarity_threshold:
-                # Mark segments as used
-                for idx in best_segment_indices:
-                    used_segments.add(idx)
-                
-                # Calculate timing
-                if isinstance(best_match, list):
-                    start_time = min(seg['start'] for seg in best_match)
-                    end_time = max(seg['end'] for seg in best_match)
-                    combined_words = []
-                    for seg in best_match:
-                        combined_words.extend(seg.get('words', []))
-                else:
-                    start_time = best_match['start']
-                    end_time = best_match['end']
-                    combined_words = best_match.get('words', [])
+                # Calculate timing: segments come out of Whisper in time order,
+                # so the run spans from its first start to its last end
+                start_time = best_match[0]['start']
+                end_time = best_match[-1]['end']
+                combined_words = [word for seg in best_match for word in seg.get('words', [])]
                 
                 aligned_segment = LyricSegment(
                     start_time=start_time,
@@ -333,9 +376,9 @@ class LyricsSynchronizer:
                 )
                 aligned_segments.append(aligned_segment)
                 
-                print(f"✓ Matched: '{original_lyric[:50]}...' (confidence: {best_score:.2f})")
+                status_lines.append(f"✓ Matched: '{original_lyric[:50]}...' (confidence: {best_score:.2f})")
             else:
-                print(f"⚠️ No match found for: '{original_lyric[:50]}...'")
+                status_lines.append(f"⚠️ No match found for: '{original_lyric[:50]}...'")
                 # Add segment with estimated timing
                 if aligned_segments:
                     estimated_start = aligned_segments[-1].end_time + 0.5
@@ -352,59 +395,148 @@ class LyricsSynchronizer:
                 )
                 aligned_segments.append(aligned_segment)
         
+        if status_lines:
+            print("\n".join(status_lines))
         return aligned_segments
     
-    def _find_multi_segment_match(self, target_lyric: str, transcription_segments: List[Dict],
-                                 used_segments: set, similarity_threshold: float) -> Tuple[Optional[List[Dict]], float, List[int]]:
+    @staticmethod
+    def _group_scores(normalized_lyrics: List[str], normalized_segments: List[str],
+                      score_cutoff: float = 0) -> List["np.ndarray"]:
         """
-        Try to match a lyric line with multiple consecutive transcription segments.
+        Score every lyric against every run of 1-4 consecutive segments.
+        
+        Entry w-1 is a (lyrics x runs) matrix on a 0-100 scale for runs of w
+        segments, indexed by the run's first segment. Single segments use the best
+        of ratio, partial_ratio and token_sort_ratio; longer runs the best of
+        ratio and token_sort_ratio on their joined text. With rapidfuzz, scores
+        below score_cutoff may be reported as 0.
         """
-        best_match = None
-        best_score = 0
-        best_indices = []
-        
-        # Try combining 2-4 consecutive segments
-        for window_size in range(2, 5):
-            for start_idx in range(len(transcription_segments) - window_size + 1):
-                # Skip if any segment in window is already used
-                if any(start_idx + i in used_segments for i in range(window_size)):
-                    continue
-                
-                # Combine segments
-                combined_segments = transcription_segments[start_idx:start_idx + window_size]
-                combined_text = " ".join([
-                    self.lyrics_processor.normalize_text(seg['text']) 
-                    for seg in combined_segments
-                ])
-                
-                # Calculate similarity
-                similarity_ratio = fuzz.ratio(target_lyric, combined_text) / 100.0
-                token_ratio = fuzz.token_sort_ratio(target_lyric, combined_text) / 100.0
-                score = max(similarity_ratio, token_ratio)
+        group_scores = []
+        # token_sort_ratio is ratio on the token-sorted text, so with rapidfuzz
+        # each string is sorted once here instead of once per pair inside cdist
+        sorted_lyrics = [" ".join(sorted(lyric.split())) for lyric in normalized_lyrics]
+        runs = [""] * (len(normalized_segments) + 1)
+        for window_size in range(1, MAX_SEGMENTS_PER_LINE + 1):
+            # Extend each run of the previous size by one segment instead of re-joining
+            separator = " " if window_size > 1 else ""
+            runs = [
+                runs[start_idx] + separator + normalized_segments[start_idx + window_size - 1]
+                for start_idx in range(len(normalized_segments) - window_size + 1)
+            ]
+            scorers = [fuzz.ratio, fuzz.token_sort_ratio]
+            if window_size == 1:
+                scorers.insert(1, fuzz.partial_ratio)
+            
+            if RAPIDFUZZ_AVAILABLE and normalized_lyrics and runs:
+                sorted_runs = [" ".join(sorted(run.split())) for run in runs]
+                comparisons = [(normalized_lyrics, runs, fuzz.ratio),
+                               (sorted_lyrics, sorted_runs, fuzz.ratio)]
+                if window_size == 1:
+                    comparisons.append((normalized_lyrics, runs, fuzz.partial_ratio))
                 
-                if score > best_score and score >= similarity_threshold:
-                    best_score = score
-                    best_match = combined_segments
-                    best_indices = list(range(start_idx, start_idx + window_size))
+                # One parallel C++ pass per comparison; score_cutoff lets the
+                # kernels abandon pairs that cannot reach it
+                scores = None
+                for queries, choices, scorer in comparisons:
+                    result = process.cdist(queries, choices, scorer=scorer,
+                                           score_cutoff=score_cutoff, workers=-1)
+                    scores = result if scores is None else np.maximum(scores, result, out=scores)
+            else:
+                scores = np.array([
+                    [LyricsSynchronizer._best_score(lyric, run, scorers) for run in runs]
+                    for lyric in normalized_lyrics
+                ], dtype=np.float32).reshape(len(normalized_lyrics), len(runs))
+            group_scores.append(scores)
+        return group_scores
+    
+    @staticmethod
+    def _best_score(lyric: str, run: str, scorers: List) -> float:
+        """Best score over the scorers, cheapest first, stopping at a perfect match."""
+        best = 0
+        for scorer in scorers:
+            best = max(best, scorer(lyric, run))
+            if best >= 100:
+                break
+        return best
+    
+    @staticmethod
+    def _best_alignment(group_scores: List["np.ndarray"], num_lyrics: int, num_segments: int,
+                        similarity_threshold: float) -> List[Optional[Tuple[int, int, float]]]:
+        """
+        Pick the in-order assignment of segment runs to lyrics with the highest total score.
         
-        return best_match, best_score, best_indices
+        Returns one (first segment, run length, confidence) per lyric, or None
+        where the lyric has no run scoring at least similarity_threshold.
+        """
+        # best[j]: best total for the lyrics so far using only the first j segments
+        best = np.zeros(num_segments + 1)
+        choices = np.zeros((num_lyrics, num_segments + 1), dtype=np.int8)
+        skipped = np.zeros((num_lyrics, num_segments + 1), dtype=bool)
+        
+        for i in range(num_lyrics):
+            # Leaving lyric i unmatched keeps the previous totals
+            candidate = best.copy()
+            for window_size, scores in enumerate(group_scores, 1):
+                if scores.shape[1] == 0:
+                    continue
+                confidence = scores[i] / 100.0
+                total = best[:-window_size] + np.where(confidence >= similarity_threshold,
+                                                      confidence, -np.inf)
+                # A run starting at segment j ends before segment j + window_size
+                better = total > candidate[window_size:]
+                candidate[window_size:][better] = total[better]
+                choices[i, window_size:][better] = window_size
+            
+            # Segments may also go unused
+            best = np.maximum.accumulate(candidate)
+            skipped[i] = candidate < best
+        
+        # Trace the winning assignment back from the last lyric
+        matches = [None] * num_lyrics
+        j = num_segments
+        for i in range(num_lyrics - 1, -1, -1):
+            while skipped[i, j]:
+                j -= 1
+            window_size = int(choices[i, j])
+            if window_size:
+                j -= window_size
+                matches[i] = (j, window_size, float(group_scores[window_size - 1][i, j]) / 100.0)
+        return matches
 
 class OutputGenerator:
     """Generates various output formats for synchronized lyrics."""
     
+    LRC_HEADER = "[ar:Generated by LyricsSynchronizer]\n[ti:Synchronized Lyrics]\n[by:AI Lyrics Sync]\n\n"
+    
+    @staticmethod
+    def save_all(segments: List[LyricSegment], lrc_path: str, srt_path: str, json_path: str):
+        """Save LRC, SRT and JSON from a single pass over the segments."""
+        lrc_lines = [OutputGenerator.LRC_HEADER]
+        srt_lines = []
+        json_segments = []
+        
+        for i, segment in enumerate(segments, 1):
+            start, end, text = segment.start_time, segment.end_time, segment.text
+            lrc_lines.append(f"{OutputGenerator._format_lrc_time(start)}{text}\n")
+            srt_lines.append(f"{i}\n{OutputGenerator._format_srt_time(start)} --> "
+                             f"{OutputGenerator._format_srt_time(end)}\n{text}\n\n")
+            json_segments.append(OutputGenerator._segment_data(segment))
+        
+        Path(lrc_path).write_text("".join(lrc_lines), encoding='utf-8')
+        print(f"💾 LRC file saved: {lrc_path}")
+        Path(srt_path).write_text("".join(srt_lines), encoding='utf-8')
+        print(f"💾 SRT file saved: {srt_path}")
+        OutputGenerator._write_json(segments, json_segments, json_path)
+        print(f"💾 JSON file saved: {json_path}")
+    
     @staticmethod
     def save_as_lrc(segments: List[LyricSegment], output_path: str):
         """Save as LRC format."""
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("[ar:Generated by LyricsSynchronizer]\n")
-            f.write(f"[ti:Synchronized Lyrics]\n")
-            f.write(f"[by:AI Lyrics Sync]\n\n")
+            f.write(OutputGenerator.LRC_HEADER)
             
             for segment in segments:
-                minutes = int(segment.start_time // 60)
-                seconds = segment.start_time % 60
-                timestamp = f"[{minutes:02d}:{seconds:05.2f}]"
-                f.write(f"{timestamp}{segment.text}\n")
+                f.write(f"{OutputGenerator._format_lrc_time(segment.start_time)}{segment.text}\n")
         
         print(f"💾 LRC file saved: {output_path}")
     
@@ -425,34 +557,52 @@ class OutputGenerator:
     @staticmethod
     def save_as_json(segments: List[LyricSegment], output_path: str):
         """Save as JSON format with detailed information."""
+        json_segments = [OutputGenerator._segment_data(segment) for segment in segments]
+        OutputGenerator._write_json(segments, json_segments, output_path)
+        
+        print(f"💾 JSON file saved: {output_path}")
+    
+    @staticmethod
+    def _segment_data(segment: LyricSegment) -> Dict:
+        """JSON entry for one segment."""
+        segment_data = {
+            "start_time": segment.start_time,
+            "end_time": segment.end_time,
+            "duration": segment.end_time - segment.start_time,
+            "text": segment.text,
+            "confidence": segment.confidence
+        }
+        
+        if segment.word_timings:
+            segment_data["word_timings"] = segment.word_timings
+        
+        return segment_data
+    
+    @staticmethod
+    def _write_json(segments: List[LyricSegment], json_segments: List[Dict], output_path: str):
+        """Write the JSON document with metadata around prepared segment entries."""
         data = {
             "metadata": {
                 "generator": "LyricsSynchronizer",
                 "version": "1.0",
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "total_segments": len(segments)
+                "total_segments": len(segments),
+                "average_confidence": (sum(seg.confidence for seg in segments) / len(segments)
+                                       if segments else 0.0)
             },
-            "segments": []
+            "segments": json_segments
         }
         
-        for segment in segments:
-            segment_data = {
-                "start_time": segment.start_time,
-                "end_time": segment.end_time,
-                "duration": segment.end_time - segment.start_time,
-                "text": segment.text,
-                "confidence": segment.confidence
-            }
-            
-            if segment.word_timings:
-                segment_data["word_timings"] = segment.word_timings
-            
-            data["segments"].append(segment_data)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        print(f"💾 JSON file saved: {output_path}")
+        if ORJSON_AVAILABLE:
+            Path(output_path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+    
+    @staticmethod
+    def _format_lrc_time(seconds: float) -> str:
+        """Format time as an LRC tag ([MM:SS.xx])."""
+        return f"[{int(seconds // 60):02d}:{seconds % 60:05.2f}]"
     
     @staticmethod
     def _format_srt_time(seconds: float) -> str:
@@ -488,7 +638,8 @@ class OutputGenerator:
 
 def sync_lyrics_to_audio(audio_path: str, lyrics_path: str, output_dir: str = "./sync_output",
                         model_size: str = "base", device: str = "auto", language: Optional[str] = None,
-                        similarity_threshold: float = 0.6) -> Dict[str, str]:
+                        similarity_threshold: float = 0.6, compute_type: str = "default",
+                        beam_size: int = 1, vad_filter: bool = True) -> Dict[str, str]:
     """
     Main function to sync lyrics with audio.
     
@@ -500,6 +651,9 @@ def sync_lyrics_to_audio(audio_path: str, lyrics_path: str, output_dir: str = ".
         device: Processing device
         language: Language code (optional)
         similarity_threshold: Minimum similarity for matching
+        compute_type: CTranslate2 compute type ("default" picks int8 on CPU, int8_bfloat16/int8_float16 on CUDA)
+        beam_size: Decoder beam width for transcription
+        vad_filter: Skip silence before transcription
     
     Returns:
         Dictionary with paths to generated files
@@ -512,7 +666,8 @@ def sync_lyrics_to_audio(audio_path: str, lyrics_path: str, output_dir: str = ".
     output_path.mkdir(exist_ok=True)
     
     # Initialize synchronizer
-    synchronizer = LyricsSynchronizer(model_size=model_size, device=device)
+    synchronizer = LyricsSynchronizer(model_size=model_size, device=device, compute_type=compute_type,
+                                      beam_size=beam_size, vad_filter=vad_filter)
     
     # Perform synchronization
     start_time = time.time()
@@ -527,23 +682,14 @@ def sync_lyrics_to_audio(audio_path: str, lyrics_path: str, output_dir: str = ".
     audio_name = Path(audio_path).stem
     output_base = output_path / f"{audio_name}_synced"
     
-    # Save in multiple formats
-    output_files = {}
-    
-    # LRC format (most common for synchronized lyrics)
-    lrc_path = f"{output_base}.lrc"
-    OutputGenerator.save_as_lrc(aligned_segments, lrc_path)
-    output_files["lrc"] = lrc_path
-    
-    # SRT format (subtitle format)
-    srt_path = f"{output_base}.srt"
-    OutputGenerator.save_as_srt(aligned_segments, srt_path)
-    output_files["srt"] = srt_path
-    
-    # JSON format (detailed data)
-    json_path = f"{output_base}.json"
-    OutputGenerator.save_as_json(aligned_segments, json_path)
-    output_files["json"] = json_path
+    # Save in multiple formats: LRC (most common for synchronized lyrics),
+    # SRT (subtitle format) and JSON (detailed data)
+    output_files = {
+        "lrc": f"{output_base}.lrc",
+        "srt": f"{output_base}.srt",
+        "json": f"{output_base}.json",
+    }
+    OutputGenerator.save_all(aligned_segments, output_files["lrc"], output_files["srt"], output_files["json"])
     
     # Print summary
     OutputGenerator.print_alignment_summary(aligned_segments)
@@ -566,6 +712,14 @@ def main():
                        help="Whisper model size")
     parser.add_argument("--device", default="auto", choices=["auto", "cpu", "cuda"],
                        help="Device to use for processing")
+    parser.add_argument("--compute_type", default="default",
+                       choices=["default", "int8", "int8_float32", "int8_float16", "int8_bfloat16",
+                                "float16", "bfloat16", "float32"],
+                       help="Model precision (default: int8 on CPU, int8_bfloat16/int8_float16 on CUDA)")
+    parser.add_argument("--beam_size", type=int, default=1,
+                       help="Decoder beam width (default: 1, greedy)")
+    parser.add_argument("--no_vad", action="store_true",
+                       help="Transcribe silent stretches instead of skipping them")
     parser.add_argument("--language", default=None,
                        help="Language code (e.g., 'en', 'ko', 'es')")
     parser.add_argument("--similarity_threshold", type=float, default=0.6,
@@ -591,7 +745,10 @@ def main():
             model_size=args.model_size,
             device=args.device,
             language=args.language,
-            similarity_threshold=args.similarity_threshold
+            similarity_threshold=args.similarity_threshold,
+            compute_type=args.compute_type,
+            beam_size=args.beam_size,
+            vad_filter=not args.no_vad
         )
         
         print(f"\n📁 Generated files:")